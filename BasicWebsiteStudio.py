@@ -1,38 +1,297 @@
 import sys
 import os
+import re
 import json
+import time
+import threading
 from pathlib import Path
 
+STARTUP_STARTED = time.perf_counter() # Reference point for --startup-profile
+
 # Import necessary PySide6 modules
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QFileDialog, QTreeView, QTextEdit, QDockWidget,
-    QWizard, QWizardPage, QVBoxLayout, QLabel, QLineEdit, QPushButton,
-    QHBoxLayout, QWidget, QTabWidget, QMessageBox, QFileSystemModel, QToolBar
+    QApplication, QMainWindow, QFileDialog, QTreeView, QDockWidget,
+    QWizard, QWizardPage, QVBoxLayout, QLabel, QLineEdit, QPushButton, QPlainTextEdit,
+    QHBoxLayout, QWidget, QTabWidget, QMessageBox, QFileSystemModel, QToolBar, QScrollBar,
+    QCheckBox, QTreeWidget, QTreeWidgetItem, QPlainTextDocumentLayout
 )
-from PySide6.QtCore import Qt, QDir, QUrl, QProcess
-from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QIcon, QAction
-from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEngineSettings
+from PySide6.QtCore import Qt, QDir, QUrl, QSortFilterProxyModel, QTimer, QObject, Signal
+from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QIcon, QAction, QTextCursor, QKeySequence, QTextDocument
+# QtWebEngine (Chromium) is imported on first use in ensure_preview; it dominates start-up time
+
+import bws_core
+
+# Hot paths report into this monitor; the Performance dock shows it, --trace FILE saves it on exit
+PERFORMANCE = bws_core.PerformanceMonitor()
 
 # --- Simple Syntax Highlighter ---
+def _compile_lexer(rules):
+    """Joins (token, pattern) rules into one alternation; match.lastgroup names the token."""
+    return re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in rules))
+
 class SimpleSyntaxHighlighter(QSyntaxHighlighter):
-    def __init__(self, parent):
+    # Block states. The *_PENDING states are still inside a <style>/<script> start tag,
+    # the *_COMMENT states are inside a comment that did not close on its line.
+    HTML, HTML_COMMENT, HTML_PENDING_STYLE, HTML_PENDING_SCRIPT, CSS, CSS_COMMENT, JS, JS_COMMENT = range(8)
+
+    HTML_LEXER = _compile_lexer([
+        ("comment_open", r"<!--"),
+        ("style_open", r"<style\b"), ("script_open", r"<script\b"),
+        ("tag", r"<[/?!]?\w+"), ("tag_close", r"/?>"),
+        ("attribute", r"\b[\w-]+(?==)"),
+        ("string", r'"[^"]*"|\'[^\']*\''),
+    ])
+    CSS_LEXER = _compile_lexer([
+        ("comment_open", r"/\*"),
+        ("embed_close", r"</style\s*>"),
+        ("string", r'"[^"]*"|\'[^\']*\''),
+        ("keyword", r"@[\w-]+|!important\b"),
+        ("property", r"[\w-]+(?=\s*:[^{}]*?(?:;|}|$))"),
+        ("selector", r"[.#][\w-]+"),
+        ("number", r"-?\b\d+(?:\.\d+)?(?:px|em|rem|%|vh|vw|s|ms|deg|fr)?"),
+    ])
+    JS_LEXER = _compile_lexer([
+        ("comment_open", r"/\*"), ("line_comment", r"//.*"),
+        ("embed_close", r"</script\s*>"),
+        ("string", r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|`(?:\\.|[^`\\])*`'),
+        ("keyword", r"\b(?:async|await|break|case|catch|class|const|continue|default|delete|do|else|export|"
+                    r"extends|false|finally|for|from|function|if|import|in|instanceof|let|new|null|of|return|"
+                    r"static|super|switch|this|throw|true|try|typeof|undefined|var|void|while|yield)\b"),
+        ("number", r"\b\d+(?:\.\d+)?\b"),
+    ])
+    LEXERS = {HTML: HTML_LEXER, HTML_PENDING_STYLE: HTML_LEXER, HTML_PENDING_SCRIPT: HTML_LEXER, CSS: CSS_LEXER, JS: JS_LEXER}
+    # comment state -> (closing marker, state to return to)
+    COMMENTS = {HTML_COMMENT: ("-->", HTML), CSS_COMMENT: ("*/", CSS), JS_COMMENT: ("*/", JS)}
+    COMMENT_STATE = {HTML: HTML_COMMENT, HTML_PENDING_STYLE: HTML_COMMENT, HTML_PENDING_SCRIPT: HTML_COMMENT, CSS: CSS_COMMENT, JS: JS_COMMENT}
+    LANGUAGE_BY_EXTENSION = {".css": CSS, ".js": JS, ".mjs": JS, ".cjs": JS}
+
+    def __init__(self, parent, file_path=None):
         super().__init__(parent)
-        self.highlighting_rules = []
-        # Rule for HTML tags
-        html_tag_format = QTextCharFormat(); html_tag_format.setForeground(QColor("#569CD6"))
-        self.highlighting_rules.append((r'<[/?!]?\w+', html_tag_format)); self.highlighting_rules.append((r'>', html_tag_format))
-        # Rule for attributes
-        attribute_format = QTextCharFormat(); attribute_format.setForeground(QColor("#9CDCFE"))
-        self.highlighting_rules.append((r'\b\w+(?=\=)', attribute_format))
-        # Rule for attribute values (strings)
-        string_format = QTextCharFormat(); string_format.setForeground(QColor("#CE9178"))
-        self.highlighting_rules.append((r'"[^"]*"', string_format)); self.highlighting_rules.append((r"'[^']*'", string_format))
-        
+        self._batch = None # [start, seconds, blocks] of the highlighting done since the last event-loop turn
+        self.initial_state = self.LANGUAGE_BY_EXTENSION.get(Path(file_path).suffix.lower(), self.HTML) if file_path else self.HTML
+        self.formats = {}
+        for token, color in (("tag", "#569CD6"), ("attribute", "#9CDCFE"), ("string", "#CE9178"), ("comment", "#6A9955"),
+                             ("keyword", "#C586C0"), ("property", "#9CDCFE"), ("selector", "#D7BA7D"), ("number", "#B5CEA8")):
+            char_format = QTextCharFormat(); char_format.setForeground(QColor(color))
+            self.formats[token] = char_format
+        # Per state, group number -> format for tokens that keep the state (None for those that
+        # switch it), so the hot loop can dispatch on match.lastindex without building group names.
+        self.plain_formats = {}
+        for state, lexer in self.LEXERS.items():
+            keeps_state = dict(self.formats, tag_close=self.formats["tag"]) if state == self.HTML else self.formats
+            self.plain_formats[state] = [None] + [keeps_state.get(name) for name in lexer.groupindex]
+
     def highlightBlock(self, text):
-        for pattern, format in self.highlighting_rules:
-            for match in __import__('re').finditer(pattern, text):
-                self.setFormat(match.start(), match.end() - match.start(), format)
+        # Blocks are timed in batches (one edit, one rehighlight, ...) that are recorded as a single
+        # span once control is back in the event loop; a span per block would flood the trace
+        started = time.perf_counter()
+        self._highlight_block(text)
+        if self._batch is None:
+            self._batch = [started, 0.0, 0]
+            QTimer.singleShot(0, self._record_batch)
+        self._batch[1] += time.perf_counter() - started; self._batch[2] += 1
+
+    def _record_batch(self):
+        started, seconds, blocks = self._batch
+        self._batch = None
+        PERFORMANCE.record("highlight", started, seconds, blocks=blocks)
+
+    def _highlight_block(self, text):
+        # Each block resumes from the state the previous block ended in, so Qt only re-highlights
+        # following blocks when an edit actually changes where a comment or <style>/<script> ends.
+        state = self.previousBlockState()
+        if state < 0: state = self.initial_state
+        formats, set_format = self.formats, self.setFormat
+        pos, length = 0, len(text)
+        while pos < length:
+            if state in self.COMMENTS:
+                marker, next_state = self.COMMENTS[state]
+                end = text.find(marker, pos)
+                if end < 0:
+                    set_format(pos, length - pos, formats["comment"]); break
+                end += len(marker)
+                set_format(pos, end - pos, formats["comment"])
+                pos, state = end, next_state
+                continue
+
+            plain_formats = self.plain_formats[state]
+            for match in self.LEXERS[state].finditer(text, pos):
+                start, pos = match.span()
+                char_format = plain_formats[match.lastindex]
+                if char_format is not None:
+                    set_format(start, pos - start, char_format); continue
+                token = match.lastgroup
+                # Everything else may switch state, so restart scanning with the matching lexer
+                if token in ("comment_open", "line_comment"):
+                    set_format(start, pos - start, formats["comment"])
+                    if token == "comment_open": state = self.COMMENT_STATE[state]
+                elif token in ("style_open", "script_open"):
+                    set_format(start, pos - start, formats["tag"])
+                    state = self.HTML_PENDING_STYLE if token == "style_open" else self.HTML_PENDING_SCRIPT
+                elif token == "tag_close":
+                    set_format(start, pos - start, formats["tag"])
+                    if match.group() == ">": state = self.CSS if state == self.HTML_PENDING_STYLE else self.JS
+                    else: state = self.HTML
+                else: # embed_close
+                    set_format(start, pos - start, formats["tag"])
+                    state = self.HTML
+                break
+            else:
+                break
+        self.setCurrentBlockState(state)
+
+# --- Live Edit Scripts ---
+# Morphs document.body into the given HTML, touching only nodes and attributes that differ.
+LIVE_PATCH_BODY_JS = """
+window.__bwsPatch = window.__bwsPatch || function (html) {
+  function sync(from, to) {
+    if (from.nodeType === 1) {
+      for (var i = from.attributes.length - 1; i >= 0; i--) {
+        if (!to.hasAttribute(from.attributes[i].name)) from.removeAttribute(from.attributes[i].name);
+      }
+      for (var j = 0; j < to.attributes.length; j++) {
+        var attr = to.attributes[j];
+        if (from.getAttribute(attr.name) !== attr.value) from.setAttribute(attr.name, attr.value);
+      }
+    }
+    var current = from.childNodes, wanted = to.childNodes;
+    for (var k = 0; k < wanted.length; k++) {
+      var old = current[k], fresh = wanted[k];
+      if (!old) from.appendChild(fresh.cloneNode(true));
+      else if (old.nodeType !== fresh.nodeType || old.nodeName !== fresh.nodeName) from.replaceChild(fresh.cloneNode(true), old);
+      else if (old.nodeType === 1) sync(old, fresh);
+      else if (old.nodeValue !== fresh.nodeValue) old.nodeValue = fresh.nodeValue;
+    }
+    while (current.length > wanted.length) from.removeChild(from.lastChild);
+  }
+  sync(document.body, new DOMParser().parseFromString(html, "text/html").body);
+};
+window.__bwsPatch(%s);
+"""
+# Shadows the <link> for the given stylesheet path with a <style> holding the editor's text.
+LIVE_REPLACE_CSS_JS = """
+(function (path, css) {
+  var style = document.querySelector('style[data-bws-live="' + path + '"]');
+  if (!style) {
+    var link = Array.prototype.find.call(document.querySelectorAll('link[rel="stylesheet"]'), function (l) {
+      return new URL(l.href, location.href).pathname === path;
+    });
+    if (!link) return;
+    style = document.createElement("style");
+    style.setAttribute("data-bws-live", path);
+    link.after(style);
+    link.disabled = true;
+  }
+  style.textContent = css;
+})(%s, %s);
+"""
+HEAD_PATTERN = re.compile(r"<head\b[^>]*>(.*?)</head\s*>", re.IGNORECASE | re.DOTALL)
+
+# --- Project Explorer Filter ---
+class ProjectFilterProxyModel(QSortFilterProxyModel):
+    """Hides entries below the project root whose name matches one of the ignore globs.
+
+    Hidden folders are never expanded by the view, so QFileSystemModel never gathers or
+    watches their contents.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root_path = None
+        self.ignore_globs = list(bws_core.DEFAULT_IGNORE_GLOBS)
+
+    def configure(self, root_path, ignore_globs):
+        self.root_path = os.path.normpath(root_path)
+        self.ignore_globs = list(ignore_globs)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        # Only filter inside the project; the ancestors of the root must stay visible
+        file_path = os.path.normpath(self.sourceModel().filePath(index))
+        if not self.root_path or not file_path.startswith(self.root_path + os.sep): return True
+        return not bws_core.is_ignored(index.data(), self.ignore_globs)
+
+# --- Start-up Profiling ---
+class StartupProfile:
+    """Collects wall-clock time per start-up phase and prints it for --startup-profile."""
+    def __init__(self, started):
+        self.last = started
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        for phase, seconds in self.phases:
+            print(f"{phase:<12} {seconds * 1000:8.1f} ms", file=sys.stderr)
+        print(f"{'total':<12} {sum(s for _, s in self.phases) * 1000:8.1f} ms", file=sys.stderr)
+
+# --- Large File Support ---
+class BuildSignals(QObject):
+    """Carries build progress from the build scheduler's thread back to the GUI thread."""
+    log = Signal(str)
+    finished = Signal(object)  # bws_core.ScheduledBuild
+
+class ValidationSignals(QObject):
+    """Carries link validation results from the validation thread back to the GUI thread."""
+    finished = Signal(object, object) # bws_core.SiteValidator, ValidationReport or exception
+
+class FileLoadSignals(QObject):
+    """Carries results of background file reads back to the GUI thread."""
+    loaded = Signal(str, int, str)  # file path, load token, content
+    failed = Signal(str, int, str)  # file path, load token, error message
+
+class SaveSignals(QObject):
+    """Carries save results from the save engine's thread back to the GUI thread."""
+    saved = Signal(str, bool, object) # file path, written, exception or None
+
+class SearchSignals(QObject):
+    """Carries find-in-files results from search threads back to the GUI thread."""
+    results = Signal(int, int, object, bool) # generation, query length, [(path, [SearchMatch])], done
+    replaced = Signal(int, int)              # occurrences, files changed on disk
+
+class MappedFileViewer(QWidget):
+    """Read-only viewer for huge files that shows one mmap page at a time.
+
+    The outer scrollbar picks the page by byte offset; scrolling past either end of the
+    text view pages in the neighbouring content.
+    """
+    PAGE_SIZE = 256 * 1024
+
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self.mapped = bws_core.MappedTextFile(file_path)
+        self.view = QPlainTextEdit(); self.view.setReadOnly(True); self.view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.page_bar = QScrollBar(Qt.Vertical)
+        self.page_bar.setRange(0, max(0, (self.mapped.size - 1) // self.PAGE_SIZE))
+        self.page_bar.valueChanged.connect(lambda page: self.show_page(page * self.PAGE_SIZE))
+        self.view.verticalScrollBar().valueChanged.connect(self.on_view_scrolled)
+        layout = QHBoxLayout(self); layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.view); layout.addWidget(self.page_bar)
+        self.start = self.end = 0
+        self.show_page(0)
+
+    def show_page(self, offset, at_end=False):
+        self.start, self.end, text = self.mapped.page(offset, self.PAGE_SIZE)
+        self.view.setPlainText(text)
+        bar = self.view.verticalScrollBar()
+        bar.setValue(bar.maximum() if at_end else 0)
+
+    def on_view_scrolled(self, value):
+        bar = self.view.verticalScrollBar()
+        if value == bar.maximum() and bar.maximum() > 0 and self.end < self.mapped.size:
+            self.page_bar.blockSignals(True); self.page_bar.setValue(self.end // self.PAGE_SIZE); self.page_bar.blockSignals(False)
+            self.show_page(self.end)
+        elif value == 0 and bar.maximum() > 0 and self.start > 0:
+            previous = max(0, self.start - self.PAGE_SIZE)
+            self.page_bar.blockSignals(True); self.page_bar.setValue(previous // self.PAGE_SIZE); self.page_bar.blockSignals(False)
+            self.show_page(previous, at_end=True)
+
+    def closeEvent(self, event):
+        self.mapped.close()
+        super().closeEvent(event)
 
 # --- Project Creation Wizard ---
 class ProjectWizard(QWizard):
@@ -43,22 +302,8 @@ class ProjectWizard(QWizard):
 
     def accept(self):
         project_name = self.field("projectName"); project_path = self.field("projectPath")
-        full_path = Path(project_path) / project_name
         try:
-            # Create directory structure
-            os.makedirs(full_path / "src" / "js", exist_ok=True)
-            os.makedirs(full_path / "src" / "css", exist_ok=True)
-            os.makedirs(full_path / "assets" / "images", exist_ok=True)
-            
-            # Create default files
-            (full_path / "src" / "index.html").write_text(f"<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <title>{project_name}</title>\n    <link rel=\"stylesheet\" href=\"css/style.css\">\n</head>\n<body>\n    <h1>Welcome to {project_name}</h1>\n    <script src=\"js/main.js\"></script>\n</body>\n</html>")
-            (full_path / "src" / "css" / "style.css").write_text("body {\n    font-family: sans-serif;\n    background-color: #f0f0f0;\n    color: #111;\n}")
-            (full_path / "src" / "js" / "main.js").write_text("console.log('Project loaded successfully!');")
-            
-            # Create project config file
-            project_config = {"name": project_name, "version": "1.0.0"}
-            with open(full_path / "project.bws", "w") as f: json.dump(project_config, f, indent=4)
-            
+            bws_core.create_project(project_path, project_name)
             super().accept()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not create project:\n{e}")
@@ -83,23 +328,84 @@ class CreateProjectPage(QWizardPage):
 
 # --- The Main Application Window ---
 class BasicWebsiteStudio(QMainWindow):
-    def __init__(self):
+    CONSOLE_MAX_LINES = 5000  # Older output is trimmed from the console
+    CONSOLE_FLUSH_MS = 50     # Console output is batched and appended at most this often
+    AUTOSAVE_DELAY_MS = 1000  # With Auto Save on, modified tabs are saved after this much typing pause
+    MAX_LIVE_TABS = 8         # Editor documents kept alive; older inactive tabs are reduced to a saved state
+    HEARTBEAT_MS = 50         # Main-loop heartbeat for stall detection
+
+    def __init__(self, profile=None):
         super().__init__()
         self.setWindowTitle("Basic Website Studio")
         self.setGeometry(100, 100, 1600, 900)
         self.current_project_path = None
-        self.build_process = None
+        self.build_scheduler = None
+        self.site_validator = None
+        self.validation_running = False
+        self.validation_again = False # Another run was asked for while one was running
+        self.watcher = None
+        self.dev_server = None
+        self.live_heads = {} # file path -> <head> markup the preview currently shows
+        self.live_timer = QTimer(self); self.live_timer.setSingleShot(True); self.live_timer.setInterval(50)
+        self.live_timer.timeout.connect(self.push_live_edit)
+        self.console_buffer = bws_core.ConsoleBuffer(self.CONSOLE_MAX_LINES)
+        self.console_timer = QTimer(self); self.console_timer.setSingleShot(True); self.console_timer.setInterval(self.CONSOLE_FLUSH_MS)
+        self.console_timer.timeout.connect(self.flush_console)
+        self.file_loader = FileLoadSignals(self)
+        self.file_loader.loaded.connect(self.on_file_loaded)
+        self.file_loader.failed.connect(self.on_file_load_failed)
+        self.build_signals = BuildSignals(self)
+        self.build_signals.log.connect(self.log_to_console)
+        self.build_signals.finished.connect(self.on_build_finished)
+        self.validation_signals = ValidationSignals(self)
+        self.validation_signals.finished.connect(self.on_validation_finished)
+        self.search_index = None
+        self.search_generation = 0 # Bumped per query so results of superseded searches are dropped
+        self.pending_goto = {}     # file path -> (line, column, length) to show once the file has loaded
+        self.load_token = 0        # Stamped on each loading editor; reads for a closed and reopened tab are dropped
+        self.live_tabs = []        # Editors with a live document, least recently used first
+        self.max_live_tabs = self.MAX_LIVE_TABS
+        self.search_signals = SearchSignals(self)
+        self.search_signals.results.connect(self.add_search_results)
+        self.search_signals.replaced.connect(self.on_replace_finished)
+        self.save_signals = SaveSignals(self)
+        self.save_signals.saved.connect(self.on_file_saved)
+        self.save_engine = bws_core.SaveEngine(self.save_signals.saved.emit)
+        self.autosave_timer = QTimer(self); self.autosave_timer.setSingleShot(True); self.autosave_timer.setInterval(self.AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.save_all)
+        self.preview = None # QWebEngineView, created by ensure_preview
+        self.tree_started = None # When the explorer root was set, until QFileSystemModel has listed it
+        self.heartbeat = QTimer(self); self.heartbeat.setInterval(self.HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(lambda: PERFORMANCE.beat(self.HEARTBEAT_MS / 1000))
+        self.heartbeat.start(); PERFORMANCE.start_watchdog()
+        self.performance_timer = QTimer(self); self.performance_timer.setInterval(1000)
+        self.performance_timer.timeout.connect(self.refresh_performance)
 
+        self._setup_ui_layout()
+        if profile: profile.mark("docks")
         self._setup_menus()
+        if profile: profile.mark("menus")
         self._setup_toolbar()
-        self._setup_ui_layout()
+        if profile: profile.mark("toolbar")
         
         self.update_action_states() # Initially disable actions
+        # Showing the preview dock later (View menu) also creates the preview; the initial show must not
+        QTimer.singleShot(0, lambda: self.preview_dock.visibilityChanged.connect(lambda visible: visible and self.ensure_preview()))
 
     def _setup_menus(self):
         file_menu = self.menuBar().addMenu("&File")
         new_proj_action = file_menu.addAction("New Project..."); new_proj_action.triggered.connect(self.create_new_project)
         open_proj_action = file_menu.addAction("Open Project..."); open_proj_action.triggered.connect(self.open_project)
+        file_menu.addSeparator()
+        save_action = file_menu.addAction("Save"); save_action.setShortcut(QKeySequence.Save); save_action.triggered.connect(lambda: self.save_tab())
+        save_all_action = file_menu.addAction("Save All"); save_all_action.setShortcut("Ctrl+Shift+S"); save_all_action.triggered.connect(self.save_all)
+        self.autosave_action = file_menu.addAction("Auto Save"); self.autosave_action.setCheckable(True)
+        edit_menu = self.menuBar().addMenu("&Edit")
+        find_action = edit_menu.addAction("Find in Files..."); find_action.setShortcut("Ctrl+Shift+F")
+        find_action.triggered.connect(lambda: (self.search_dock.show(), self.search_dock.raise_(), self.search_entry.setFocus(), self.search_entry.selectAll()))
+        view_menu = self.menuBar().addMenu("&View")
+        for dock in (self.project_dock, self.preview_dock, self.console_dock, self.search_dock, self.performance_dock):
+            view_menu.addAction(dock.toggleViewAction())
 
     def _setup_toolbar(self):
         toolbar = QToolBar("Main Toolbar")
@@ -114,34 +420,96 @@ class BasicWebsiteStudio(QMainWindow):
         self.build_action.triggered.connect(self.build_project)
         toolbar.addAction(self.build_action)
 
+        self.validate_action = QAction(style.standardIcon(style.StandardPixmap.SP_FileDialogContentsView), "Validate Links and Assets", self)
+        self.validate_action.triggered.connect(self.validate_project)
+        toolbar.addAction(self.validate_action)
+
+        self.cancel_build_action = QAction(style.standardIcon(style.StandardPixmap.SP_BrowserStop), "Cancel Build", self)
+        self.cancel_build_action.triggered.connect(self.cancel_build)
+        self.cancel_build_action.setEnabled(False)
+        toolbar.addAction(self.cancel_build_action)
+
+        self.live_action = QAction(style.standardIcon(style.StandardPixmap.SP_BrowserReload), "Live Edit (Preview Unsaved Changes)", self)
+        self.live_action.setCheckable(True)
+        self.live_action.toggled.connect(lambda checked: checked and self.push_live_edit())
+        toolbar.addAction(self.live_action)
+
     def _setup_ui_layout(self):
         self.editor_tabs = QTabWidget(); self.editor_tabs.setTabsClosable(True)
         self.editor_tabs.tabCloseRequested.connect(self.close_tab)
+        self.editor_tabs.currentChanged.connect(self.on_tab_changed)
         self.setCentralWidget(self.editor_tabs)
 
-        project_dock = QDockWidget("Project Explorer", self)
+        self.project_dock = project_dock = QDockWidget("Project Explorer", self)
+        # The model is rooted at the opened project in load_project, so Qt only gathers and watches that tree
         self.project_view = QTreeView(); self.fs_model = QFileSystemModel()
-        self.fs_model.setRootPath(QDir.rootPath()); self.fs_model.setFilter(QDir.NoDotAndDotDot | QDir.AllDirs | QDir.Files)
-        self.project_view.setModel(self.fs_model)
-        for i in range(1, self.fs_model.columnCount()): self.project_view.hideColumn(i)
+        self.fs_model.setFilter(QDir.NoDotAndDotDot | QDir.AllDirs | QDir.Files)
+        self.fs_proxy = ProjectFilterProxyModel(self); self.fs_proxy.setSourceModel(self.fs_model)
         self.project_view.doubleClicked.connect(self.open_file_from_tree)
+        self.fs_model.directoryLoaded.connect(self.on_directory_loaded)
         project_dock.setWidget(self.project_view)
         self.addDockWidget(Qt.LeftDockWidgetArea, project_dock)
 
-        preview_dock = QDockWidget("Live Preview", self)
-        self.preview = QWebEngineView()
-        self.preview.settings().setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
-        self.preview.settings().setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessFileUrls, True)
-        preview_dock.setWidget(self.preview)
+        self.preview_dock = preview_dock = QDockWidget("Live Preview", self)
+        placeholder = QLabel("Press Play to start the live preview."); placeholder.setAlignment(Qt.AlignCenter)
+        preview_dock.setWidget(placeholder)
         self.addDockWidget(Qt.RightDockWidgetArea, preview_dock)
 
-        console_dock = QDockWidget("Output", self)
-        self.output_console = QTextEdit()
+        self.console_dock = console_dock = QDockWidget("Output", self)
+        self.output_console = QPlainTextEdit()
         self.output_console.setReadOnly(True)
+        self.output_console.setMaximumBlockCount(self.CONSOLE_MAX_LINES)
         self.output_console.setStyleSheet("font-family: Consolas, monospace;")
         console_dock.setWidget(self.output_console)
         self.addDockWidget(Qt.BottomDockWidgetArea, console_dock)
 
+        self.search_dock = search_dock = QDockWidget("Find in Files", self)
+        search_widget = QWidget(); search_layout = QVBoxLayout(search_widget); search_layout.setContentsMargins(2, 2, 2, 2)
+        search_bar = QHBoxLayout()
+        self.search_entry = QLineEdit(); self.search_entry.setPlaceholderText("Find")
+        self.search_entry.returnPressed.connect(self.run_search)
+        self.search_case = QCheckBox("Aa"); self.search_case.setToolTip("Match case")
+        self.search_case.toggled.connect(self.run_search)
+        search_bar.addWidget(self.search_entry); search_bar.addWidget(self.search_case)
+        replace_bar = QHBoxLayout()
+        self.replace_entry = QLineEdit(); self.replace_entry.setPlaceholderText("Replace")
+        replace_button = QPushButton("Replace All"); replace_button.clicked.connect(self.replace_all)
+        replace_bar.addWidget(self.replace_entry); replace_bar.addWidget(replace_button)
+        self.search_results = QTreeWidget(); self.search_results.setHeaderHidden(True)
+        self.search_results.itemActivated.connect(self.on_search_result_activated)
+        search_layout.addLayout(search_bar); search_layout.addLayout(replace_bar); search_layout.addWidget(self.search_results)
+        search_dock.setWidget(search_widget)
+        self.addDockWidget(Qt.BottomDockWidgetArea, search_dock)
+        self.tabifyDockWidget(console_dock, search_dock); console_dock.raise_()
+
+        self.performance_dock = performance_dock = QDockWidget("Performance", self)
+        performance_widget = QWidget(); performance_layout = QVBoxLayout(performance_widget); performance_layout.setContentsMargins(2, 2, 2, 2)
+        self.performance_table = QTreeWidget(); self.performance_table.setRootIsDecorated(False)
+        self.performance_table.setHeaderLabels(["Path", "Calls", "Total ms", "Mean ms", "Max ms"])
+        performance_bar = QHBoxLayout()
+        self.stall_label = QLabel()
+        reset_button = QPushButton("Reset"); reset_button.clicked.connect(lambda: (PERFORMANCE.reset(), self.refresh_performance()))
+        export_button = QPushButton("Export Trace..."); export_button.clicked.connect(self.export_trace)
+        performance_bar.addWidget(self.stall_label); performance_bar.addStretch(); performance_bar.addWidget(reset_button); performance_bar.addWidget(export_button)
+        performance_layout.addWidget(self.performance_table); performance_layout.addLayout(performance_bar)
+        performance_dock.setWidget(performance_widget)
+        self.addDockWidget(Qt.BottomDockWidgetArea, performance_dock)
+        self.tabifyDockWidget(console_dock, performance_dock); performance_dock.hide()
+        # The table is only refreshed while the dock is shown
+        performance_dock.visibilityChanged.connect(lambda visible: (self.refresh_performance(), self.performance_timer.start()) if visible else self.performance_timer.stop())
+
+    def ensure_preview(self):
+        """Imports QtWebEngine and replaces the placeholder with the preview on first use."""
+        if self.preview is None:
+            from PySide6.QtWebEngineWidgets import QWebEngineView
+            from PySide6.QtWebEngineCore import QWebEngineSettings
+            self.preview = QWebEngineView()
+            self.preview.settings().setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
+            self.preview.settings().setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessFileUrls, True)
+            self.preview_dock.setWidget(self.preview)
+        self.preview_dock.show()
+        return self.preview
+
     def create_new_project(self):
         wizard = ProjectWizard(self)
         if wizard.exec() == QWizard.Accepted:
@@ -155,82 +523,445 @@ class BasicWebsiteStudio(QMainWindow):
         elif dir_name:
             QMessageBox.warning(self, "Error", "This is not a valid project folder (project.bws is missing).")
 
+    @PERFORMANCE.timed("load project")
     def load_project(self, path):
         self.current_project_path = path
-        self.project_view.setRootIndex(self.fs_model.index(path))
+        config = bws_core.load_project_config(path)
+        self.autosave_action.setChecked(bool(config.get("autosave", False)))
+        self.max_live_tabs = max(1, int(config.get("max_live_tabs", self.MAX_LIVE_TABS)))
+        self.fs_proxy.configure(path, bws_core.ignore_globs(config))
+        if self.dev_server:
+            self.dev_server.stop(); self.dev_server = None
+        # The explorer follows QFileSystemModel; the watcher feeds the live preview and keeps
+        # the project index (.bws/index.json) current so the next open starts warm
+        if self.watcher: self.watcher.stop()
+        self.watcher = bws_core.ProjectWatcher.for_project(path, config)
+        self.search_index = bws_core.SearchIndex(path, bws_core.ignore_globs(config))
+        threading.Thread(target=self.search_index.build, name="SearchIndex", daemon=True).start()
+        self.watcher.subscribe(self.search_index.apply_events)
+        self.watcher.start()
+        if self.build_scheduler: self.build_scheduler.stop()
+        self.build_scheduler = bws_core.BuildScheduler(path, config, log=self.build_signals.log.emit, finished=self.build_signals.finished.emit)
+        self.cancel_build_action.setEnabled(False)
+        self.site_validator = bws_core.SiteValidator(path, config)
+        self.live_heads.clear()
+        self.tree_started = time.perf_counter()
+        root_index = self.fs_model.setRootPath(path)
+        if self.project_view.model() is None:
+            self.project_view.setModel(self.fs_proxy)
+            for i in range(1, self.fs_proxy.columnCount()): self.project_view.hideColumn(i)
+        self.project_view.setRootIndex(self.fs_proxy.mapFromSource(root_index))
         self.setWindowTitle(f"Basic Website Studio - {Path(path).name}")
         self.update_action_states() # Enable actions now that a project is loaded
         self.play_project()         # Show a preview immediately
 
+    def on_directory_loaded(self, path):
+        # QFileSystemModel lists folders on its own thread; the project root is the one that fills the explorer
+        if self.tree_started is not None and Path(path) == Path(self.current_project_path):
+            PERFORMANCE.record("populate tree", self.tree_started, time.perf_counter() - self.tree_started, path=path)
+            self.tree_started = None
+
     def open_file_from_tree(self, index):
-        file_path = self.fs_model.filePath(index)
+        index = self.fs_proxy.mapToSource(index)
         if self.fs_model.isDir(index): return
-        for i in range(self.editor_tabs.count()):
-            if self.editor_tabs.widget(i).property("file_path") == file_path:
-                self.editor_tabs.setCurrentIndex(i); return
+        self.open_file(self.fs_model.filePath(index))
+
+    def open_file(self, file_path, line=None, column=0, length=0):
+        """Opens file_path in a tab (or selects its tab), optionally selecting length characters at line/column."""
+        editor = self.find_tab(file_path)
+        if editor is not None:
+            self.editor_tabs.setCurrentWidget(editor)
+            if line is not None: self.goto_position(editor, line, column, length)
+            return
+        if line is not None: self.pending_goto[file_path] = (line, column, length)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f: content = f.read()
-            editor = QTextEdit(); editor.setPlainText(content)
-            editor.setProperty("file_path", file_path); SimpleSyntaxHighlighter(editor.document())
+            size = os.path.getsize(file_path)
+            if size >= bws_core.HUGE_FILE_SIZE:
+                editor = MappedFileViewer(file_path)
+            else:
+                # The tab shows up at once; the content is read on a worker thread and streamed in
+                editor = QPlainTextEdit(); editor.setReadOnly(True); editor.setPlaceholderText("Loading...")
+                editor.setProperty("large_file", size >= bws_core.LARGE_FILE_SIZE)
+                self.load_token += 1; editor.setProperty("load_token", self.load_token)
+                threading.Thread(target=self._read_file, args=(file_path, self.load_token), daemon=True).start()
+            editor.setProperty("file_path", file_path)
+            editor.setProperty("open_started", time.perf_counter()) # Until the last chunk is in: "open file"
             self.editor_tabs.addTab(editor, Path(file_path).name)
             self.editor_tabs.setCurrentWidget(editor)
         except Exception as e: QMessageBox.critical(self, "Error", f"Could not open file:\n{e}")
 
+    def _read_file(self, file_path, token):
+        try:
+            content = bws_core.read_text_file(file_path)
+            self.save_engine.remember(file_path, content)
+            self.file_loader.loaded.emit(file_path, token, content)
+        except Exception as e: self.file_loader.failed.emit(file_path, token, str(e))
+
+    def loading_editor(self, file_path, token):
+        """The tab this read was started for, or None once it was closed (or closed and reopened)."""
+        editor = self.find_tab(file_path)
+        return editor if editor is not None and editor.property("load_token") == token else None
+
+    def find_tab(self, file_path):
+        for i in range(self.editor_tabs.count()):
+            if self.editor_tabs.widget(i).property("file_path") == file_path: return self.editor_tabs.widget(i)
+        return None
+
+    def on_file_loaded(self, file_path, token, content):
+        editor = self.loading_editor(file_path, token)
+        if editor is None: return # Closed while loading
+        if editor.property("large_file"): editor.setLineWrapMode(QPlainTextEdit.NoWrap)
+        editor.setUndoRedoEnabled(False)
+        self._insert_chunks(editor, bws_core.split_into_chunks(content))
+
+    @PERFORMANCE.timed("insert chunk")
+    def _insert_chunks(self, editor, chunks):
+        """Appends one chunk per event-loop turn so the window stays responsive while a file loads."""
+        if self.find_tab(editor.property("file_path")) is not editor: return
+        cursor = QTextCursor(editor.document()); cursor.movePosition(QTextCursor.End)
+        cursor.insertText(chunks.pop(0))
+        if chunks:
+            QTimer.singleShot(0, lambda: self._insert_chunks(editor, chunks)); return
+        editor.moveCursor(QTextCursor.Start)
+        editor.setUndoRedoEnabled(True); editor.setReadOnly(False)
+        file_path = editor.property("file_path")
+        if not editor.property("large_file"): SimpleSyntaxHighlighter(editor.document(), file_path)
+        editor.textChanged.connect(self.schedule_live_push)
+        editor.document().setModified(False)
+        editor.document().modificationChanged.connect(lambda dirty: self.update_tab_title(editor))
+        editor.textChanged.connect(lambda: editor.document().isModified() and self.schedule_autosave())
+        state = editor.property("restore_state")
+        if state: # Rebuilt after being unloaded
+            editor.setProperty("restore_state", None)
+            cursor = editor.textCursor(); cursor.setPosition(min(state["cursor"], editor.document().characterCount() - 1)); editor.setTextCursor(cursor)
+            editor.verticalScrollBar().setValue(state["scroll"])
+            editor.document().setModified(state["dirty"])
+        position = self.pending_goto.pop(file_path, None)
+        if position: self.goto_position(editor, *position)
+        started = editor.property("open_started")
+        PERFORMANCE.record("open file", started, time.perf_counter() - started, path=file_path)
+
+    def on_tab_changed(self, index):
+        """Rebuilds an unloaded editor when its tab is shown and unloads the least recently used ones."""
+        editor = self.editor_tabs.widget(index)
+        if not isinstance(editor, QPlainTextEdit): return
+        state = editor.property("saved_state")
+        if state:
+            editor.setProperty("saved_state", None); editor.setProperty("restore_state", state)
+            editor.setProperty("open_started", time.perf_counter())
+            editor.setUndoRedoEnabled(False)
+            self._insert_chunks(editor, bws_core.split_into_chunks(state["text"]))
+        if editor in self.live_tabs: self.live_tabs.remove(editor)
+        self.live_tabs.append(editor)
+        for candidate in list(self.live_tabs):
+            if len(self.live_tabs) <= self.max_live_tabs: break
+            if candidate is not editor and not candidate.isReadOnly(): self.unload_tab(candidate) # The shown and loading tabs stay
+
+    def unload_tab(self, editor):
+        """Replaces the editor's document (text, undo stack, highlighter) with its text, cursor, scroll position and dirty flag."""
+        document = editor.document()
+        editor.setProperty("saved_state", {"text": editor.toPlainText(), "cursor": editor.textCursor().position(),
+                                           "scroll": editor.verticalScrollBar().value(), "dirty": document.isModified()})
+        editor.textChanged.disconnect()
+        owned = document.parent() is editor # The editor's initial document is deleted by Qt itself
+        empty = QTextDocument(editor); empty.setDocumentLayout(QPlainTextDocumentLayout(empty))
+        editor.setDocument(empty); editor.setReadOnly(True)
+        if owned: document.deleteLater()
+        self.live_tabs.remove(editor)
+
+    def is_dirty(self, editor):
+        if not isinstance(editor, QPlainTextEdit): return False
+        state = editor.property("saved_state")
+        if state: return state["dirty"]
+        return not editor.isReadOnly() and editor.document().isModified()
+
+    def set_saved_dirty(self, editor, dirty):
+        """Sets the dirty flag of an unloaded editor's saved state."""
+        state = editor.property("saved_state"); state["dirty"] = dirty
+        editor.setProperty("saved_state", state); self.update_tab_title(editor)
+
+    def update_tab_title(self, editor):
+        index = self.editor_tabs.indexOf(editor)
+        if index >= 0: self.editor_tabs.setTabText(index, Path(editor.property("file_path")).name + (" ●" if self.is_dirty(editor) else ""))
+
+    def schedule_autosave(self):
+        """Restarts the autosave countdown, so saving waits for a pause in typing."""
+        if self.autosave_action.isChecked(): self.autosave_timer.start()
+
+    def save_tab(self, editor=None):
+        """Hands the tab's text to the save engine; the current tab by default."""
+        editor = editor or self.editor_tabs.currentWidget()
+        if not isinstance(editor, QPlainTextEdit): return
+        state = editor.property("saved_state")
+        if state: # Unloaded
+            self.save_engine.save(editor.property("file_path"), state["text"]); self.set_saved_dirty(editor, False)
+            return
+        if editor.isReadOnly(): return
+        self.save_engine.save(editor.property("file_path"), editor.toPlainText())
+        editor.document().setModified(False)
+
+    def save_all(self):
+        for i in range(self.editor_tabs.count()):
+            if self.is_dirty(self.editor_tabs.widget(i)): self.save_tab(self.editor_tabs.widget(i))
+
+    def on_file_saved(self, file_path, written, error):
+        if error is None:
+            if written and file_path.lower().endswith(bws_core.SiteValidator.EXTENSIONS) and \
+               bws_core.load_project_config(self.current_project_path).get("validate", {}).get("on_save"): self.validate_project()
+            return
+        self.log_to_console(f"Could not save {file_path}: {error}")
+        editor = self.find_tab(file_path)
+        if editor is None or not isinstance(editor, QPlainTextEdit): return
+        if editor.property("saved_state"): self.set_saved_dirty(editor, True)
+        else: editor.document().setModified(True)
+
+    def goto_position(self, editor, line, column, length=0):
+        if not isinstance(editor, QPlainTextEdit): return # Memory-mapped viewer
+        if editor.isReadOnly(): # Unloaded or still loading
+            self.pending_goto[editor.property("file_path")] = (line, column, length); return
+        cursor = QTextCursor(editor.document().findBlockByNumber(line - 1))
+        cursor.movePosition(QTextCursor.Right, QTextCursor.MoveAnchor, column)
+        cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor, length)
+        editor.setTextCursor(cursor); editor.centerCursor(); editor.setFocus()
+
+    def run_search(self):
+        """Queries the search index on a worker thread and streams the ranked results into the dock."""
+        self.search_generation += 1
+        self.search_results.clear()
+        query = self.search_entry.text()
+        if not (query and self.search_index): return
+        if not self.search_index.ready.is_set(): QTreeWidgetItem(self.search_results, ["Indexing project..."])
+        threading.Thread(target=self._search_worker, args=(self.search_generation, query, self.search_case.isChecked()), daemon=True).start()
+
+    def _search_worker(self, generation, query, case_sensitive):
+        self.search_index.ready.wait()
+        batch = []
+        for result in self.search_index.search(query, case_sensitive):
+            if generation != self.search_generation: return # A newer query replaced this one
+            batch.append(result)
+            if len(batch) == 50:
+                self.search_signals.results.emit(generation, len(query), batch, False); batch = []
+        self.search_signals.results.emit(generation, len(query), batch, True)
+
+    def add_search_results(self, generation, length, batch, done):
+        if generation != self.search_generation: return
+        first = self.search_results.topLevelItem(0)
+        if first is not None and first.data(0, Qt.UserRole) is None: self.search_results.clear() # "Indexing..." placeholder
+        for path, matches in batch:
+            node = QTreeWidgetItem(self.search_results, [f"{os.path.relpath(path, self.current_project_path)} ({len(matches)})"])
+            node.setData(0, Qt.UserRole, (path, None, 0, 0))
+            for match in matches:
+                QTreeWidgetItem(node, [f"{match.line}: {match.text}"]).setData(0, Qt.UserRole, (path, match.line, match.column, length))
+            node.setExpanded(self.search_results.topLevelItemCount() <= 20)
+        if done and self.search_results.topLevelItemCount() == 0: QTreeWidgetItem(self.search_results, ["No results."])
+
+    def on_search_result_activated(self, item):
+        target = item.data(0, Qt.UserRole)
+        if target: self.open_file(*target)
+
+    def replace_all(self):
+        query, replacement, case_sensitive = self.search_entry.text(), self.replace_entry.text(), self.search_case.isChecked()
+        if not (query and self.search_index and self.search_index.ready.is_set()): return
+        # A loading editor would finish with the old text and a later save would undo the replacement on disk
+        loading = [editor for editor in map(self.editor_tabs.widget, range(self.editor_tabs.count()))
+                   if isinstance(editor, QPlainTextEdit) and not editor.property("saved_state") and editor.isReadOnly()]
+        if loading:
+            QMessageBox.information(self, "Replace All", f"Wait until {len(loading)} file(s) have finished loading."); return
+        if QMessageBox.question(self, "Replace All", f"Replace '{query}' with '{replacement}' in all project files?") != QMessageBox.Yes: return
+        # Files open in an editor are changed there, so their unsaved edits are kept; the rest on disk
+        pattern = re.compile(re.escape(query), 0 if case_sensitive else re.IGNORECASE)
+        in_editors, skip = 0, set()
+        for i in range(self.editor_tabs.count()):
+            editor = self.editor_tabs.widget(i)
+            if not isinstance(editor, QPlainTextEdit): continue
+            state = editor.property("saved_state")
+            if state: # Unloaded; change the kept text
+                skip.add(editor.property("file_path"))
+                state["text"], count = pattern.subn(lambda m: replacement, state["text"])
+                if count:
+                    editor.setProperty("saved_state", state); self.set_saved_dirty(editor, True)
+                    in_editors += count
+                continue
+            skip.add(editor.property("file_path"))
+            text, count = pattern.subn(lambda m: replacement, editor.toPlainText())
+            if not count: continue
+            cursor = QTextCursor(editor.document()); cursor.select(QTextCursor.Document); cursor.insertText(text) # One undo step
+            in_editors += count
+        def worker():
+            counts = self.search_index.replace(query, replacement, case_sensitive, skip)
+            self.search_signals.replaced.emit(in_editors + sum(counts.values()), len(counts))
+        threading.Thread(target=worker, daemon=True).start()
+
+    def on_replace_finished(self, occurrences, files):
+        self.log_to_console(f"Replaced {occurrences} occurrence(s); {files} file(s) changed on disk.")
+        self.run_search()
+
+    def on_file_load_failed(self, file_path, token, message):
+        editor = self.loading_editor(file_path, token)
+        if editor is None: return
+        self._discard_tab(self.editor_tabs.indexOf(editor))
+        QMessageBox.critical(self, "Error", f"Could not open file:\n{message}")
+
     def close_tab(self, index):
+        """Closes a tab, offering to save unsaved changes, and deletes its editor and highlighter."""
+        editor = self.editor_tabs.widget(index)
+        if self.is_dirty(editor):
+            answer = QMessageBox.question(self, "Unsaved Changes", f"Save changes to {Path(editor.property('file_path')).name}?",
+                                          QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel)
+            if answer == QMessageBox.Cancel: return
+            if answer == QMessageBox.Save: self.save_tab(editor)
+        self._discard_tab(index)
+
+    def _discard_tab(self, index):
+        editor = self.editor_tabs.widget(index)
         self.editor_tabs.removeTab(index)
+        if editor in self.live_tabs: self.live_tabs.remove(editor)
+        self.pending_goto.pop(editor.property("file_path"), None)
+        self.live_heads.pop(editor.property("file_path"), None)
+        editor.close() # MappedFileViewer unmaps its file in closeEvent
+        editor.deleteLater()
+
+    def closeEvent(self, event):
+        dirty = [self.editor_tabs.widget(i) for i in range(self.editor_tabs.count()) if self.is_dirty(self.editor_tabs.widget(i))]
+        if dirty:
+            answer = QMessageBox.question(self, "Unsaved Changes", f"Save changes to {len(dirty)} file(s) before closing?",
+                                          QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel)
+            if answer == QMessageBox.Cancel: event.ignore(); return
+            if answer == QMessageBox.Save: self.save_all()
+        self.save_engine.stop()
+        if self.build_scheduler: self.build_scheduler.stop()
+        # Let the watcher write the project index so the next open skips the walk
+        if self.watcher: self.watcher.stop(wait=True)
+        if self.dev_server: self.dev_server.stop()
+        PERFORMANCE.stop()
+        super().closeEvent(event)
         
     def update_action_states(self):
         """Enables or disables toolbar actions based on whether a project is loaded."""
         project_loaded = self.current_project_path is not None
         self.play_action.setEnabled(project_loaded)
         self.build_action.setEnabled(project_loaded)
+        self.validate_action.setEnabled(project_loaded)
+        self.live_action.setEnabled(project_loaded)
 
     def play_project(self):
         if not self.current_project_path: return
-        index_path = Path(self.current_project_path) / "src" / "index.html"
-        if index_path.exists():
-            self.preview.setUrl(QUrl.fromLocalFile(str(index_path.resolve())))
-        else:
-            self.output_console.append("Error: 'src/index.html' not found.")
+        src_path = Path(self.current_project_path) / "src"
+        if not (src_path / "index.html").exists():
+            self.log_to_console("Error: 'src/index.html' not found."); return
+        if self.dev_server is None:
+            self.dev_server = bws_core.DevServer(src_path, watcher=self.watcher); self.dev_server.start()
+            self.log_to_console(f"Live preview running at {self.dev_server.url}")
+        # The page reloads itself on file changes; Play forces a reload of the open page
+        if self.dev_server.has_clients(): self.dev_server.broadcast("reload")
+        else: self.ensure_preview().setUrl(QUrl(self.dev_server.url))
     
+    def schedule_live_push(self):
+        # Restarting the single-shot timer coalesces a burst of keystrokes into one push
+        if self.live_action.isChecked(): self.live_timer.start()
+
+    def push_live_edit(self):
+        """Pushes the active editor's unsaved text into the preview without touching the disk."""
+        editor = self.editor_tabs.currentWidget()
+        if not (isinstance(editor, QPlainTextEdit) and self.preview and self.dev_server and self.current_project_path): return
+        file_path = editor.property("file_path")
+        src_path = Path(self.current_project_path) / "src"
+        try: url_path = "/" + Path(file_path).resolve().relative_to(src_path.resolve()).as_posix()
+        except ValueError: return # Not served by the preview
+        text = editor.toPlainText()
+
+        if url_path.endswith(".css"):
+            self.preview.page().runJavaScript(LIVE_REPLACE_CSS_JS % (json.dumps(url_path), json.dumps(text)))
+            return
+        shown_path = self.preview.url().path()
+        if not url_path.endswith(".html") or url_path not in (shown_path, shown_path + "index.html"): return
+
+        head = HEAD_PATTERN.search(text)
+        head = head.group(1) if head else ""
+        if file_path not in self.live_heads:
+            disk_head = HEAD_PATTERN.search(Path(file_path).read_text(encoding="utf-8", errors="replace"))
+            self.live_heads[file_path] = disk_head.group(1) if disk_head else ""
+        if head == self.live_heads[file_path]:
+            self.preview.page().runJavaScript(LIVE_PATCH_BODY_JS % json.dumps(text))
+        else:
+            # Structural <head> change: reload the page from the buffer instead of the file
+            self.live_heads[file_path] = head
+            html = bws_core.inject_live_reload(text.encode("utf-8")).decode("utf-8")
+            self.preview.setHtml(html, QUrl(self.dev_server.url.rstrip("/") + url_path))
+
     def build_project(self):
-        if not self.current_project_path: return
-        
-        self.output_console.clear()
-        self.output_console.append("Starting build process...")
-        
-        self.build_process = QProcess()
-        self.build_process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
-        self.build_process.readyReadStandardOutput.connect(self.handle_build_output)
-        self.build_process.finished.connect(self.on_build_finished)
-        
-        # IMPORTANT: Set the working directory so npm can find package.json
-        self.build_process.setWorkingDirectory(self.current_project_path)
+        if not self.build_scheduler: return
+        # Clicks while a build runs are folded into one follow-up build
+        if not self.build_scheduler.busy:
+            self.console_buffer.drain(); self.output_console.clear()
+            self.log_to_console("Starting build process...")
+        self.cancel_build_action.setEnabled(True)
+        self.build_scheduler.request()
 
-        # Defines the actual command to be run.
-        # NOTE: This requires Node.js and npm to be installed, and for the
-        # project to have a 'package.json' with a "build" script.
-        self.build_process.start("npm", ["run", "build"])
-        
-        self.build_action.setEnabled(False) # Disable button during build
+    def cancel_build(self):
+        if self.build_scheduler and self.build_scheduler.cancel(): self.log_to_console("Cancelling build...")
 
-    def handle_build_output(self):
-        data = self.build_process.readAllStandardOutput().data().decode()
-        self.output_console.append(data.strip())
-        
-    def on_build_finished(self):
-        exit_code = self.build_process.exitCode()
-        if exit_code == 0:
-            self.output_console.append("\nBuild completed successfully.")
+    def on_build_finished(self, build):
+        if not build.queued: self.cancel_build_action.setEnabled(False)
+
+    def validate_project(self):
+        """Checks links and assets on a worker thread; a request during a run is folded into one more run."""
+        if not self.site_validator: return
+        if self.validation_running:
+            self.validation_again = True; return
+        self.validation_running = True
+        threading.Thread(target=self._run_validation, args=(self.site_validator,), daemon=True).start()
+
+    def _run_validation(self, validator):
+        try: report = validator.validate()
+        except Exception as e: report = e
+        self.validation_signals.finished.emit(validator, report)
+
+    def on_validation_finished(self, validator, report):
+        self.validation_running = False
+        if isinstance(report, Exception): self.log_to_console(f"Validation failed: {report}")
         else:
-            self.output_console.append(f"\nBuild failed with exit code: {exit_code}")
-        self.build_process = None
-        self.build_action.setEnabled(True) # Re-enable the button
+            for line in bws_core.format_validation(report, validator.project_path): self.log_to_console(line)
+        if self.validation_again:
+            self.validation_again = False; self.validate_project()
+
+    def refresh_performance(self):
+        self.performance_table.clear()
+        for row in bws_core.format_performance(PERFORMANCE):
+            item = QTreeWidgetItem(list(row))
+            for column in range(1, 5): item.setTextAlignment(column, Qt.AlignRight)
+            self.performance_table.addTopLevelItem(item)
+        self.stall_label.setText(f"Stalls over {PERFORMANCE.stall_threshold * 1000:.0f} ms: {PERFORMANCE.stalls}")
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "bws-trace.json", "Chrome trace (*.json)")
+        if not path: return
+        try:
+            PERFORMANCE.export_trace(path)
+            self.log_to_console(f"Trace written to {path} (open it in chrome://tracing or ui.perfetto.dev).")
+        except OSError as e: QMessageBox.critical(self, "Error", f"Could not write the trace:\n{e}")
+
+    def log_to_console(self, message):
+        # Output is buffered and appended in one batch, so chatty builds cost one insert per flush
+        if self.console_buffer.write(message): self.console_timer.start()
+
+    @PERFORMANCE.timed("console flush")
+    def flush_console(self):
+        text = self.console_buffer.drain()
+        if text: self.output_console.appendPlainText(text)
 
 if __name__ == "__main__":
+    profile = StartupProfile(STARTUP_STARTED) if "--startup-profile" in sys.argv else None
+    if profile: profile.mark("imports")
+    # Required because QtWebEngine is only imported after the application exists
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     # A simple stylesheet for a dark look
-    app.setStyleSheet("QWidget { background-color: #2b2b2b; color: #f0f0f0; } QMainWindow, QDockWidget, QTabWidget, QMenu, QMenuBar, QToolBar { background-color: #3c3c3c; } QTreeView { background-color: #2b2b2b; border: none; } QTextEdit { background-color: #1e1e1e; font-family: Consolas, monospace; border: none; } QPushButton, QLineEdit { background-color: #555; border: 1px solid #777; padding: 5px; } QPushButton:hover { background-color: #666; } QWizard, QMessageBox { background-color: #3c3c3c; }")
-    window = BasicWebsiteStudio()
+    app.setStyleSheet("QWidget { background-color: #2b2b2b; color: #f0f0f0; } QMainWindow, QDockWidget, QTabWidget, QMenu, QMenuBar, QToolBar { background-color: #3c3c3c; } QTreeView { background-color: #2b2b2b; border: none; } QTextEdit, QPlainTextEdit { background-color: #1e1e1e; font-family: Consolas, monospace; border: none; } QPushButton, QLineEdit { background-color: #555; border: 1px solid #777; padding: 5px; } QPushButton:hover { background-color: #666; } QWizard, QMessageBox { background-color: #3c3c3c; }")
+    if profile: profile.mark("application")
+    window = BasicWebsiteStudio(profile)
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    if profile: QTimer.singleShot(0, lambda: (profile.mark("first paint"), profile.report()))
+    exit_code = app.exec()
+    if "--trace" in sys.argv[1:-1]: PERFORMANCE.export_trace(sys.argv[sys.argv.index("--trace") + 1])
+    sys.exit(exit_code)
\ No newline at end of file
@@ -1,7 +1,9 @@
 import sys
 import os
+import re
 import json
-import subprocess
+import time
+import bisect
 import threading
 from pathlib import Path
 import webbrowser
@@ -9,43 +11,175 @@ import webbrowser
 # Import necessary Tkinter modules
 from tkinter import (
     Tk, Frame, Menu, Text, Scrollbar, messagebox,
-    StringVar, Label, Entry, Button, filedialog, PanedWindow, Toplevel
+    StringVar, BooleanVar, Label, Entry, Button, filedialog, PanedWindow, Toplevel
 )
-from tkinter import ttk
+from tkinter import ttk, TclError
+
+# The GUI-free core module lives at the repository root, next to the PySide6 edition
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import bws_core
+
+# Hot paths report into this monitor; View > Performance shows it, --trace FILE saves it on exit
+PERFORMANCE = bws_core.PerformanceMonitor()
 
 # --- Simple Syntax Highlighter for Tkinter Text Widget ---
 class SimpleSyntaxHighlighter:
+    TAGS = ('tag', 'attribute', 'string')
+    # One precompiled alternation; the name of the group that matched is the tag to apply.
+    TOKEN_PATTERN = re.compile(
+        r'(?P<tag><[/?!]?\w+|>)'
+        r'|(?P<attribute>\b\w+(?==))'
+        r'|(?P<string>"[^"\n]*"|\'[^\'\n]*\')'
+    )
+    IDLE_DELAY_MS = 80  # Keystrokes arriving within this window are coalesced into one pass
+    CHUNK_LINES = 500   # Lines highlighted per background step
+
     def __init__(self, text_widget):
         self.text_widget = text_widget
-        self.rules = [
-            (r'<[/?!]?\w+', 'tag'),
-            (r'>', 'tag'),
-            (r'\b\w+(?=\=)', 'attribute'),
-            (r'"[^"]*"', 'string'),
-            (r"'[^']*'", 'string'),
-        ]
         self.text_widget.tag_configure('tag', foreground='#569CD6')
         self.text_widget.tag_configure('attribute', foreground='#9CDCFE')
         self.text_widget.tag_configure('string', foreground='#CE9178')
-        
+
+        self._line_count = self._last_line()
+        self._dirty = None           # (first_line, last_line) waiting for the idle timer
+        self._pending = None         # after() id of the idle timer
+        self._background_job = None  # after() id of the next background chunk
+
         self.text_widget.bind('<KeyRelease>', self.on_key_release)
+        # Edits that can touch arbitrary lines get a full (viewport-first) pass instead
+        for sequence in ('<<Paste>>', '<<Undo>>', '<<Redo>>'):
+            self.text_widget.bind(sequence, lambda event: self.text_widget.after_idle(self.highlight), add='+')
+        self.text_widget.bind('<Destroy>', self.cancel, add='+')
+        self.highlight()
+
+    def cancel(self, event=None):
+        """Drops queued passes, so none runs against a destroyed widget."""
+        for job in (self._pending, self._background_job):
+            if job: self.text_widget.after_cancel(job)
+        self._pending = self._background_job = None
 
     def on_key_release(self, event=None):
-        self.highlight()
+        # The cursor ends up on the last edited line; any lines added above it were also touched
+        insert_line = int(self.text_widget.index('insert').split('.')[0])
+        line_count = self._last_line()
+        added = max(line_count - self._line_count, 0)
+        self._line_count = line_count
+        self.mark_dirty(insert_line - added, insert_line)
+
+    def mark_dirty(self, first, last):
+        """Queues lines first..last for re-highlighting once typing pauses."""
+        if self._dirty:
+            first, last = min(first, self._dirty[0]), max(last, self._dirty[1])
+        self._dirty = (max(first, 1), last)
+        if self._pending:
+            self.text_widget.after_cancel(self._pending)
+        self._pending = self.text_widget.after(self.IDLE_DELAY_MS, self._flush_dirty)
+
+    def _flush_dirty(self):
+        self._pending = None
+        if not self._dirty: return
+        first, last = self._dirty
+        self._dirty = None
+        self.highlight_lines(first, min(last, self._last_line()))
 
     def highlight(self):
-        # Remove all existing tags to avoid overlaps
-        for tag in ['tag', 'attribute', 'string']:
-            self.text_widget.tag_remove(tag, '1.0', 'end')
-        
-        # Apply new tags
-        content = self.text_widget.get('1.0', 'end-1c')
-        for pattern, tag_name in self.rules:
-            import re
-            for match in re.finditer(pattern, content):
-                start_index = f"1.0+{match.start()}c"
-                end_index = f"1.0+{match.end()}c"
-                self.text_widget.tag_add(tag_name, start_index, end_index)
+        """Re-highlights the whole buffer: visible lines now, the rest in background chunks."""
+        if self._background_job:
+            self.text_widget.after_cancel(self._background_job)
+            self._background_job = None
+        self._line_count = last_line = self._last_line()
+        first_visible = int(self.text_widget.index('@0,0').split('.')[0])
+        last_visible = int(self.text_widget.index(f'@0,{self.text_widget.winfo_height()}').split('.')[0])
+        self.highlight_lines(first_visible, last_visible)
+
+        remaining = [(last_visible + 1, last_line), (1, first_visible - 1)]
+        self._background_job = self.text_widget.after(1, self._highlight_in_background, remaining)
+
+    def _highlight_in_background(self, ranges):
+        self._background_job = None
+        ranges = [(first, last) for first, last in ranges if first <= last]
+        if not ranges: return
+        first, last = ranges[0]
+        chunk_end = min(first + self.CHUNK_LINES - 1, last, self._last_line())
+        self.highlight_lines(first, chunk_end)
+        ranges[0] = (chunk_end + 1, min(last, self._last_line()))
+        self._background_job = self.text_widget.after(1, self._highlight_in_background, ranges)
+
+    @PERFORMANCE.timed("highlight lines")
+    def highlight_lines(self, first, last):
+        """Re-tokenizes lines first..last (inclusive) and applies the tags in one call per tag."""
+        if first > last: return
+        start, end = f'{first}.0', f'{last}.end'
+        for tag in self.TAGS:
+            self.text_widget.tag_remove(tag, start, end)
+
+        ranges = {tag: [] for tag in self.TAGS}
+        lines = self.text_widget.get(start, end).split('\n')
+        for line_no, line in enumerate(lines, first):
+            for match in self.TOKEN_PATTERN.finditer(line):
+                ranges[match.lastgroup] += (f'{line_no}.{match.start()}', f'{line_no}.{match.end()}')
+        for tag, indices in ranges.items():
+            if indices:
+                self.text_widget.tag_add(tag, *indices)
+
+    def _last_line(self):
+        return int(self.text_widget.index('end-1c').split('.')[0])
+
+# --- Read-only Viewer for Huge Files ---
+class MappedFileViewer(ttk.Frame):
+    """Read-only viewer for huge files that shows one mmap page at a time.
+
+    The scrollbar spans the whole file by byte offset; scrolling past either end of the
+    shown page pages in the neighbouring content.
+    """
+    PAGE_SIZE = 256 * 1024
+
+    def __init__(self, parent, file_path):
+        super().__init__(parent)
+        self.mapped = bws_core.MappedTextFile(file_path)
+        self.text = Text(self, wrap='none', bg="#1e1e1e", fg="#f0f0f0", font=("Consolas", 11), borderwidth=0)
+        self.scrollbar = Scrollbar(self, command=self.on_scroll)
+        self.scrollbar.pack(side='right', fill='y')
+        self.text.pack(fill='both', expand=True)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.text.bind(sequence, self.on_wheel)
+        self.bind('<Destroy>', lambda event: self.mapped.close())
+        self.start = self.end = 0
+        self.show_page(0)
+
+    def show_page(self, offset, at_end=False):
+        self.start, self.end, content = self.mapped.page(offset, self.PAGE_SIZE)
+        self.text.config(state='normal')
+        self.text.delete('1.0', 'end')
+        self.text.insert('1.0', content)
+        self.text.config(state='disabled')
+        self.text.yview_moveto(1.0 if at_end else 0.0)
+        size = max(self.mapped.size, 1)
+        self.scrollbar.set(self.start / size, self.end / size)
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.show_page(int(float(amount) * self.mapped.size))
+        elif unit == 'pages':
+            self.show_page(self.end if int(amount) > 0 else max(0, self.start - self.PAGE_SIZE))
+        else:
+            self.scroll_lines(int(amount))
+
+    def on_wheel(self, event):
+        if event.num in (4, 5):
+            self.scroll_lines(-3 if event.num == 4 else 3)
+        else:
+            self.scroll_lines(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def scroll_lines(self, lines):
+        top, bottom = self.text.yview()
+        if lines > 0 and bottom >= 1.0 and self.end < self.mapped.size:
+            self.show_page(self.end)
+        elif lines < 0 and top <= 0.0 and self.start > 0:
+            self.show_page(max(0, self.start - self.PAGE_SIZE), at_end=True)
+        else:
+            self.text.yview_scroll(lines, 'units')
 
 # --- Project Creation Wizard ---
 class ProjectWizard(object):
@@ -94,42 +228,72 @@ class ProjectWizard(object):
             messagebox.showerror("Error", "Project name and location cannot be empty.", parent=self.top)
             return
 
-        full_path = Path(project_path) / project_name
         try:
-            # Create directory structure
-            os.makedirs(full_path / "src" / "js", exist_ok=True)
-            os.makedirs(full_path / "src" / "css", exist_ok=True)
-            os.makedirs(full_path / "assets" / "images", exist_ok=True)
-            
-            # Create default files
-            (full_path / "src" / "index.html").write_text(f"<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <title>{project_name}</title>\n    <link rel=\"stylesheet\" href=\"css/style.css\">\n</head>\n<body>\n    <h1>Welcome to {project_name}</h1>\n    <script src=\"js/main.js\"></script>\n</body>\n</html>", encoding='utf-8')
-            (full_path / "src" / "css" / "style.css").write_text("body {\n    font-family: sans-serif;\n    background-color: #f0f0f0;\n    color: #111;\n}", encoding='utf-8')
-            (full_path / "src" / "js" / "main.js").write_text("console.log('Project loaded successfully!');", encoding='utf-8')
-            
-            # Create project config file
-            project_config = {"name": project_name, "version": "1.0.0"}
-            with open(full_path / "project.bws", "w", encoding='utf-8') as f: json.dump(project_config, f, indent=4)
-            
-            self.result = str(full_path)
+            self.result = bws_core.create_project(project_path, project_name)
             self.top.destroy()
         except Exception as e:
             messagebox.showerror("Error", f"Could not create project:\n{e}", parent=self.top)
 
 # --- The Main Application Window ---
 class BasicWebsiteStudio(Tk):
+    CONSOLE_MAX_LINES = 5000  # Older output is trimmed from the console
+    CONSOLE_FLUSH_MS = 50     # Console output is batched and inserted at most this often
+    AUTOSAVE_DELAY_MS = 1000  # With Auto Save on, modified tabs are saved after this much typing pause
+    MAX_LIVE_TABS = 8         # Editor widgets kept alive; older inactive tabs are reduced to a saved state
+    HEARTBEAT_MS = 50         # Main-loop heartbeat for stall detection
+
     def __init__(self):
         super().__init__()
         self.title("Basic Website Studio")
         self.geometry("1600x900")
         self.current_project_path = None
-        self.build_process = None
+        self.build_scheduler = None
+        self.site_validator = None
+        self.validation_running = False
+        self.validation_again = False # Another run was asked for while one was running
         self.open_tabs = {} # To track file paths and their corresponding tabs
+        self.project_config = {}
+        self.ignore_globs = list(bws_core.DEFAULT_IGNORE_GLOBS)
+        self.watcher = None
+        self.dev_server = None
+        self.search_index = None
+        self.search_generation = 0 # Bumped per query so results of superseded searches are dropped
+        self.pending_goto = {}     # file path -> (line, column, length) to show once the file has loaded
+        self.live_tabs = []        # Tab frames with a live editor, least recently used first
+        self.max_live_tabs = self.MAX_LIVE_TABS
+        self.console_buffer = bws_core.ConsoleBuffer(self.CONSOLE_MAX_LINES)
+        # Saves are written on the engine's thread; results come back through the Tk main loop
+        self.save_engine = bws_core.SaveEngine(lambda path, written, error: self.after(0, self._on_file_saved, path, written, error))
+        self.autosave = BooleanVar(value=False)
+        self.autosave_job = None
+        self.performance_window = None
 
         self._setup_styles()
         self._setup_menus()
         self._setup_ui_layout()
         
         self.update_action_states() # Initially disable actions
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(self.HEARTBEAT_MS, self._heartbeat)
+        PERFORMANCE.start_watchdog()
+
+    def _heartbeat(self):
+        PERFORMANCE.beat(self.HEARTBEAT_MS / 1000)
+        self.after(self.HEARTBEAT_MS, self._heartbeat)
+
+    def on_close(self):
+        dirty = [tab_frame for tab_frame in self.open_tabs.values() if self.is_dirty(tab_frame)]
+        if dirty:
+            answer = messagebox.askyesnocancel("Unsaved Changes", f"Save changes to {len(dirty)} file(s) before closing?")
+            if answer is None: return
+            if answer: self.save_all()
+        self.save_engine.stop()
+        if self.build_scheduler: self.build_scheduler.stop()
+        # Let the watcher write the project index so the next open skips the walk
+        if self.watcher: self.watcher.stop(wait=True)
+        if self.dev_server: self.dev_server.stop()
+        PERFORMANCE.stop()
+        self.destroy()
 
     def _setup_styles(self):
         style = ttk.Style(self)
@@ -153,8 +317,20 @@ class BasicWebsiteStudio(Tk):
         file_menu = Menu(self.menubar, tearoff=0, bg="#3c3c3c", fg="#f0f0f0")
         file_menu.add_command(label="New Project...", command=self.create_new_project)
         file_menu.add_command(label="Open Project...", command=self.open_project)
+        file_menu.add_separator()
+        file_menu.add_command(label="Save", accelerator="Ctrl+S", command=self.save_tab)
+        file_menu.add_command(label="Save All", accelerator="Ctrl+Shift+S", command=self.save_all)
+        file_menu.add_checkbutton(label="Auto Save", variable=self.autosave, command=self.schedule_autosave)
+        file_menu.add_command(label="Close Tab", accelerator="Ctrl+W", command=self.close_tab)
+        self.bind("<Control-s>", lambda event: self.save_tab())
+        self.bind("<Control-S>", lambda event: self.save_all())
+        self.bind("<Control-w>", lambda event: self.close_tab())
         self.menubar.add_cascade(label="File", menu=file_menu)
 
+        view_menu = Menu(self.menubar, tearoff=0, bg="#3c3c3c", fg="#f0f0f0")
+        view_menu.add_command(label="Performance...", command=self.show_performance)
+        self.menubar.add_cascade(label="View", menu=view_menu)
+
     def _setup_ui_layout(self):
         # Toolbar
         toolbar = ttk.Frame(self, style="TFrame")
@@ -162,18 +338,48 @@ class BasicWebsiteStudio(Tk):
         self.play_button.pack(side='left', padx=2, pady=2)
         self.build_button = ttk.Button(toolbar, text="✓ Build Project", command=self.build_project)
         self.build_button.pack(side='left', padx=2, pady=2)
+        self.validate_button = ttk.Button(toolbar, text="⚑ Validate Links", command=self.validate_project)
+        self.validate_button.pack(side='left', padx=2, pady=2)
+        self.cancel_button = ttk.Button(toolbar, text="■ Cancel Build", command=self.cancel_build, state='disabled')
+        self.cancel_button.pack(side='left', padx=2, pady=2)
         toolbar.pack(side='top', fill='x')
 
         # Main layout using PanedWindow
         main_pane = PanedWindow(self, orient='horizontal', sashrelief='raised', bg='#3c3c3c')
         main_pane.pack(fill='both', expand=True)
 
+        # Left pane (Project Explorer + Find in Files)
+        left_pane = PanedWindow(main_pane, orient='vertical', sashrelief='raised', bg='#3c3c3c')
+        main_pane.add(left_pane)
+
         # Project Explorer
-        project_frame = ttk.Frame(main_pane) # Removed width for better auto-sizing
+        project_frame = ttk.Frame(left_pane) # Removed width for better auto-sizing
         self.project_view = ttk.Treeview(project_frame)
         self.project_view.pack(fill='both', expand=True)
         self.project_view.bind("<Double-1>", self.on_tree_double_click)
-        main_pane.add(project_frame)
+        self.project_view.bind("<<TreeviewOpen>>", self.on_tree_open)
+        left_pane.add(project_frame)
+
+        # Find in Files
+        search_frame = ttk.Frame(left_pane)
+        search_bar = ttk.Frame(search_frame)
+        self.search_query = StringVar(); self.replace_text = StringVar(); self.search_case = BooleanVar(value=False)
+        self.search_entry = ttk.Entry(search_bar, textvariable=self.search_query)
+        self.search_entry.pack(side='left', fill='x', expand=True, padx=2, pady=2)
+        self.search_entry.bind("<Return>", self.run_search)
+        ttk.Checkbutton(search_bar, text="Aa", variable=self.search_case, command=self.run_search).pack(side='left')
+        search_bar.pack(side='top', fill='x')
+        replace_bar = ttk.Frame(search_frame)
+        ttk.Entry(replace_bar, textvariable=self.replace_text).pack(side='left', fill='x', expand=True, padx=2, pady=2)
+        self.replace_button = ttk.Button(replace_bar, text="Replace All", command=self.replace_all)
+        self.replace_button.pack(side='left', padx=2)
+        replace_bar.pack(side='top', fill='x')
+        self.search_results = ttk.Treeview(search_frame, show='tree')
+        self.search_results.pack(fill='both', expand=True)
+        self.search_results.bind("<Double-1>", self.on_search_result_activated)
+        self.search_results.bind("<Return>", self.on_search_result_activated)
+        left_pane.add(search_frame)
+        self.bind("<Control-Shift-F>", lambda event: self.search_entry.focus_set())
 
         # Right pane (Editor + Console)
         right_pane = PanedWindow(main_pane, orient='vertical', sashrelief='raised', bg='#3c3c3c')
@@ -181,6 +387,8 @@ class BasicWebsiteStudio(Tk):
 
         # Editor Tabs
         self.editor_tabs = ttk.Notebook(right_pane)
+        self.editor_tabs.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.editor_tabs.bind("<Button-2>", self.on_tab_middle_click)
         # KORRIGIERTE ZEILE HIER:
         right_pane.add(self.editor_tabs)
 
@@ -206,28 +414,90 @@ class BasicWebsiteStudio(Tk):
         elif dir_name:
             messagebox.showwarning("Error", "This is not a valid project folder (project.bws is missing).")
 
+    @PERFORMANCE.timed("load project")
     def load_project(self, path):
         self.current_project_path = path
         self.title(f"Basic Website Studio - {Path(path).name}")
+        self.project_config = bws_core.load_project_config(path)
+        self.ignore_globs = bws_core.ignore_globs(self.project_config)
+        self.autosave.set(bool(self.project_config.get("autosave", False)))
+        self.max_live_tabs = max(1, int(self.project_config.get("max_live_tabs", self.MAX_LIVE_TABS)))
         self.populate_project_view(path)
+        if self.dev_server:
+            self.dev_server.stop(); self.dev_server = None
+        self.search_index = bws_core.SearchIndex(path, self.ignore_globs)
+        threading.Thread(target=self.search_index.build, name="SearchIndex", daemon=True).start()
+        self.start_watcher(path)
+        if self.build_scheduler: self.build_scheduler.stop()
+        # Builds run on the scheduler's thread; completion is handed back to the Tk main loop
+        self.build_scheduler = bws_core.BuildScheduler(path, self.project_config, log=self.log_to_console,
+                                                       finished=lambda build: self.after(0, self._on_build_finished, build))
+        self.cancel_button.config(state='disabled')
+        self.site_validator = bws_core.SiteValidator(path, self.project_config)
         self.update_action_states()
         self.play_project()
 
+    @PERFORMANCE.timed("populate tree")
     def populate_project_view(self, path):
         for item in self.project_view.get_children():
             self.project_view.delete(item)
         
         abspath = os.path.abspath(path)
-        root_node = self.project_view.insert('', 'end', text=os.path.basename(path), open=True, values=[abspath])
+        # Item ids are absolute paths, so watcher events can find their nodes directly
+        root_node = self.project_view.insert('', 'end', iid=abspath, text=os.path.basename(path), open=True, values=[abspath])
         self.process_directory(root_node, abspath)
 
+    @PERFORMANCE.timed("process directory")
     def process_directory(self, parent, path):
-        for p in sorted(Path(path).iterdir()):
-            abspath = os.path.abspath(p)
-            isdir = os.path.isdir(abspath)
-            node = self.project_view.insert(parent, 'end', text=p.name, open=False, values=[abspath])
-            if isdir:
-                self.process_directory(node, abspath)
+        """Lists a single directory level; subdirectories get a placeholder child until opened."""
+        try:
+            with os.scandir(path) as it:
+                entries = sorted((e for e in it if not self.is_ignored(e.name)), key=lambda e: e.name)
+        except OSError:
+            return
+        for entry in entries:
+            self.insert_tree_node(parent, 'end', entry.path, entry.is_dir())
+
+    def insert_tree_node(self, parent, index, path, is_dir):
+        node = self.project_view.insert(parent, index, iid=path, text=os.path.basename(path), open=False, values=[path])
+        if is_dir:
+            self.project_view.insert(node, 'end', text="Loading...", tags=('placeholder',))
+
+    def is_ignored(self, name):
+        return bws_core.is_ignored(name, self.ignore_globs)
+
+    def is_loaded(self, item_id):
+        """True if the directory node exists and its children have been listed."""
+        if not self.project_view.exists(item_id): return False
+        children = self.project_view.get_children(item_id)
+        return not (len(children) == 1 and 'placeholder' in self.project_view.item(children[0], 'tags'))
+
+    def start_watcher(self, path):
+        if self.watcher: self.watcher.stop()
+        self.watcher = bws_core.ProjectWatcher.for_project(path, self.project_config)
+        # Events arrive on the watcher thread; apply them from the Tk main loop
+        self.watcher.subscribe(lambda events: self.after(0, self.apply_file_events, events))
+        self.watcher.subscribe(self.search_index.apply_events)
+        self.watcher.start()
+
+    def apply_file_events(self, events):
+        """Patches the explorer with watcher events instead of re-walking the project."""
+        for event in events:
+            if event.kind in ('deleted', 'renamed') and self.project_view.exists(event.path):
+                self.project_view.delete(event.path)
+            if event.kind in ('created', 'renamed'):
+                path = event.new_path or event.path
+                parent = os.path.dirname(path)
+                # Unlisted folders pick the entry up when they are opened
+                if self.project_view.exists(path) or not self.is_loaded(parent): continue
+                names = [self.project_view.item(child, 'text') for child in self.project_view.get_children(parent)]
+                self.insert_tree_node(parent, bisect.bisect(names, os.path.basename(path)), path, event.is_dir)
+
+    def on_tree_open(self, event=None):
+        item_id = self.project_view.focus()
+        if not self.is_loaded(item_id):
+            self.project_view.delete(*self.project_view.get_children(item_id))
+            self.process_directory(item_id, str(self.project_view.item(item_id)['values'][0]))
 
     def on_tree_double_click(self, event):
         item_id = self.project_view.focus()
@@ -235,101 +505,393 @@ class BasicWebsiteStudio(Tk):
         
         file_path = self.project_view.item(item_id)['values'][0]
         if not os.path.isfile(file_path): return
+        self.open_file(file_path)
 
+    def open_file(self, file_path, line=None, column=0, length=0):
+        """Opens file_path in a tab (or selects its tab), optionally selecting length characters at line/column."""
         if file_path in self.open_tabs:
             self.editor_tabs.select(self.open_tabs[file_path])
+            if line is not None: self.goto_position(self.open_tabs[file_path], line, column, length)
             return
+        if line is not None: self.pending_goto[file_path] = (line, column, length)
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f: content = f.read()
-            
+            size = os.path.getsize(file_path)
             tab_frame = ttk.Frame(self.editor_tabs)
-            editor = Text(tab_frame, wrap='word', bg="#1e1e1e", fg="#f0f0f0", font=("Consolas", 11), insertbackground="white", borderwidth=0, undo=True)
-            editor_scroll = Scrollbar(tab_frame, command=editor.yview)
-            editor['yscrollcommand'] = editor_scroll.set
-            editor_scroll.pack(side='right', fill='y')
-            editor.pack(fill='both', expand=True)
-            editor.insert('1.0', content)
-            
-            SimpleSyntaxHighlighter(editor)
-            
+            tab_frame.file_path = file_path
+            tab_frame.open_started = time.perf_counter() # Until the last chunk is in: "open file"
+            if size >= bws_core.HUGE_FILE_SIZE:
+                MappedFileViewer(tab_frame, file_path).pack(fill='both', expand=True)
+            else:
+                tab_frame.large = size >= bws_core.LARGE_FILE_SIZE
+                tab_frame.saved_state = None
+                self._create_editor(tab_frame)
+                # The tab shows up at once; the content is read on a worker thread and streamed in
+                threading.Thread(target=self._read_file, args=(file_path, tab_frame, tab_frame.large), daemon=True).start()
+
             self.editor_tabs.add(tab_frame, text=os.path.basename(file_path))
             self.open_tabs[file_path] = tab_frame
             self.editor_tabs.select(tab_frame)
-            editor.focus_set()
 
         except Exception as e:
             messagebox.showerror("Error", f"Could not open file:\n{e}")
 
+    def _create_editor(self, tab_frame):
+        """Adds a disabled "Loading..." Text editor to the tab; _insert_chunks fills and enables it."""
+        # Large files skip word wrap and highlighting; both are too slow on megabytes of text
+        editor = Text(tab_frame, wrap='none' if tab_frame.large else 'word', bg="#1e1e1e", fg="#f0f0f0", font=("Consolas", 11), insertbackground="white", borderwidth=0, undo=False)
+        editor_scroll = Scrollbar(tab_frame, command=editor.yview)
+        editor['yscrollcommand'] = editor_scroll.set
+        editor_scroll.pack(side='right', fill='y')
+        editor.pack(fill='both', expand=True)
+        editor.insert('1.0', "Loading...")
+        editor.config(state='disabled')
+        tab_frame.editor = editor
+        tab_frame.highlighter = None # Set once the last chunk is in (never for large files)
+        tab_frame.loading = True # Until _insert_chunks has inserted the last chunk
+
+    def on_tab_changed(self, event=None):
+        """Rebuilds an unloaded editor when its tab is shown and unloads the least recently used ones."""
+        if not self.editor_tabs.select(): return
+        tab_frame = self.nametowidget(self.editor_tabs.select())
+        if not hasattr(tab_frame, 'large'): return # Memory-mapped viewer
+        if tab_frame.editor is None:
+            self._create_editor(tab_frame)
+            tab_frame.open_started = time.perf_counter()
+            self._insert_chunks(tab_frame, bws_core.split_into_chunks(tab_frame.saved_state['text']), tab_frame.large, True)
+        if tab_frame in self.live_tabs: self.live_tabs.remove(tab_frame)
+        self.live_tabs.append(tab_frame)
+        for candidate in list(self.live_tabs):
+            if len(self.live_tabs) <= self.max_live_tabs: break
+            if candidate is not tab_frame and not candidate.loading: self.unload_tab(candidate) # The shown and loading tabs stay
+
+    def unload_tab(self, tab_frame):
+        """Replaces the tab's editor (widget, undo stack, highlighter tags) with its text, cursor, scroll position and dirty flag."""
+        editor = tab_frame.editor
+        tab_frame.saved_state = {'text': editor.get('1.0', 'end-1c'), 'cursor': editor.index('insert'),
+                                 'scroll': editor.yview()[0], 'dirty': editor.edit_modified()}
+        for child in tab_frame.winfo_children(): child.destroy()
+        tab_frame.editor = tab_frame.highlighter = None
+        self.live_tabs.remove(tab_frame)
+
+    def on_tab_middle_click(self, event):
+        try:
+            index = self.editor_tabs.index(f"@{event.x},{event.y}")
+        except TclError:
+            return
+        self.close_tab(self.nametowidget(self.editor_tabs.tabs()[index]))
+
+    def close_tab(self, tab_frame=None):
+        """Closes a tab (the current one by default), offering to save unsaved changes, and destroys its widgets."""
+        if tab_frame is None:
+            if not self.editor_tabs.select(): return
+            tab_frame = self.nametowidget(self.editor_tabs.select())
+        if self.is_dirty(tab_frame):
+            answer = messagebox.askyesnocancel("Unsaved Changes", f"Save changes to {os.path.basename(tab_frame.file_path)}?")
+            if answer is None: return
+            if answer: self.save_tab(tab_frame)
+        self._discard_tab(tab_frame)
+
+    def _discard_tab(self, tab_frame):
+        self.open_tabs.pop(tab_frame.file_path, None)
+        self.pending_goto.pop(tab_frame.file_path, None)
+        if tab_frame in self.live_tabs: self.live_tabs.remove(tab_frame)
+        self.editor_tabs.forget(tab_frame)
+        tab_frame.destroy()
+
+    def _read_file(self, file_path, tab_frame, large):
+        try:
+            text = bws_core.read_text_file(file_path)
+            self.save_engine.remember(file_path, text)
+            self.after(0, self._insert_chunks, tab_frame, bws_core.split_into_chunks(text), large, True)
+        except Exception as e:
+            self.after(0, self._on_file_load_failed, file_path, str(e))
+
+    @PERFORMANCE.timed("insert chunk")
+    def _insert_chunks(self, tab_frame, chunks, large, first=False):
+        """Inserts one chunk per main-loop turn so the window stays responsive while a file loads."""
+        if not tab_frame.winfo_exists(): return # Closed while loading
+        editor = tab_frame.editor
+        if first:
+            editor.config(state='normal')
+            editor.delete('1.0', 'end')
+        editor.insert('end', chunks.pop(0))
+        if chunks:
+            self.after(1, self._insert_chunks, tab_frame, chunks, large)
+            return
+        tab_frame.loading = False
+        editor.config(undo=True)
+        editor.edit_reset()
+        editor.mark_set('insert', '1.0')
+        if not large:
+            tab_frame.highlighter = SimpleSyntaxHighlighter(editor)
+        editor.edit_modified(False)
+        editor.bind('<<Modified>>', lambda event: self.on_editor_modified(tab_frame))
+        editor.bind('<KeyRelease>', lambda event: self.is_dirty(tab_frame) and self.schedule_autosave(), add='+')
+        if tab_frame.saved_state: # Rebuilt after being unloaded
+            state, tab_frame.saved_state = tab_frame.saved_state, None
+            editor.mark_set('insert', state['cursor'])
+            editor.yview_moveto(state['scroll'])
+            editor.edit_modified(state['dirty'])
+        editor.focus_set()
+        position = self.pending_goto.pop(tab_frame.file_path, None)
+        if position: self.goto_position(tab_frame, *position)
+        PERFORMANCE.record("open file", tab_frame.open_started, time.perf_counter() - tab_frame.open_started,
+                           path=tab_frame.file_path)
+
+    def goto_position(self, tab_frame, line, column, length=0):
+        editor = getattr(tab_frame, 'editor', None)
+        if editor is None and not getattr(tab_frame, 'saved_state', None): return # Memory-mapped viewer
+        if editor is None or tab_frame.loading: # Unloaded or still loading
+            self.pending_goto[tab_frame.file_path] = (line, column, length); return
+        index = f"{line}.{column}"
+        editor.mark_set('insert', index)
+        editor.tag_remove('sel', '1.0', 'end')
+        editor.tag_add('sel', index, f"{index} + {length}c")
+        editor.see(index)
+        editor.focus_set()
+
+    def is_dirty(self, tab_frame):
+        editor = getattr(tab_frame, 'editor', None)
+        if editor is None: return bool(getattr(tab_frame, 'saved_state', None) and tab_frame.saved_state['dirty'])
+        return not tab_frame.loading and editor.edit_modified()
+
+    def set_tab_title(self, tab_frame):
+        self.editor_tabs.tab(tab_frame, text=os.path.basename(tab_frame.file_path) + (" ●" if self.is_dirty(tab_frame) else ""))
+
+    def on_editor_modified(self, tab_frame):
+        self.set_tab_title(tab_frame)
+        if self.is_dirty(tab_frame): self.schedule_autosave()
+
+    def schedule_autosave(self):
+        """Restarts the autosave countdown, so saving waits for a pause in typing."""
+        if self.autosave_job: self.after_cancel(self.autosave_job); self.autosave_job = None
+        if self.autosave.get(): self.autosave_job = self.after(self.AUTOSAVE_DELAY_MS, self.save_all)
+
+    def save_tab(self, tab_frame=None):
+        """Hands the tab's text to the save engine; the current tab by default."""
+        if tab_frame is None:
+            if not self.editor_tabs.select(): return
+            tab_frame = self.nametowidget(self.editor_tabs.select())
+        editor = getattr(tab_frame, 'editor', None)
+        if editor is None and getattr(tab_frame, 'saved_state', None): # Unloaded
+            self.save_engine.save(tab_frame.file_path, tab_frame.saved_state['text'])
+            tab_frame.saved_state['dirty'] = False; self.set_tab_title(tab_frame)
+            return
+        if editor is None or tab_frame.loading: return
+        self.save_engine.save(tab_frame.file_path, editor.get('1.0', 'end-1c'))
+        editor.edit_modified(False)
+
+    def save_all(self):
+        self.autosave_job = None
+        for tab_frame in self.open_tabs.values():
+            if self.is_dirty(tab_frame): self.save_tab(tab_frame)
+
+    def _on_file_saved(self, file_path, written, error):
+        if error is None:
+            if written and file_path.lower().endswith(bws_core.SiteValidator.EXTENSIONS) and \
+               self.project_config.get("validate", {}).get("on_save"): self.validate_project()
+            return
+        self.log_to_console(f"Could not save {file_path}: {error}")
+        tab_frame = self.open_tabs.get(file_path)
+        if tab_frame is None or not tab_frame.winfo_exists(): return
+        if tab_frame.editor is not None: tab_frame.editor.edit_modified(True)
+        elif tab_frame.saved_state: tab_frame.saved_state['dirty'] = True; self.set_tab_title(tab_frame)
+
+    def run_search(self, event=None):
+        """Queries the search index on a worker thread and streams the ranked results into the panel."""
+        self.search_generation += 1
+        self.search_results.delete(*self.search_results.get_children())
+        query = self.search_query.get()
+        if not (query and self.search_index): return
+        if not self.search_index.ready.is_set():
+            self.search_results.insert('', 'end', text="Indexing project...", tags=('placeholder',))
+        threading.Thread(target=self._search_worker, args=(self.search_generation, query, self.search_case.get()), daemon=True).start()
+
+    def _search_worker(self, generation, query, case_sensitive):
+        self.search_index.ready.wait()
+        batch = []
+        for result in self.search_index.search(query, case_sensitive):
+            if generation != self.search_generation: return # A newer query replaced this one
+            batch.append(result)
+            if len(batch) == 50:
+                self.after(0, self._add_search_results, generation, len(query), batch); batch = []
+        self.after(0, self._add_search_results, generation, len(query), batch, True)
+
+    def _add_search_results(self, generation, length, batch, done=False):
+        if generation != self.search_generation: return
+        self.search_results.delete(*self.search_results.tag_has('placeholder'))
+        for path, matches in batch:
+            node = self.search_results.insert('', 'end', text=f"{os.path.relpath(path, self.current_project_path)} ({len(matches)})",
+                                              values=[path], open=len(self.search_results.get_children()) < 20)
+            for match in matches:
+                self.search_results.insert(node, 'end', text=f"{match.line}: {match.text}", values=[path, match.line, match.column, length])
+        if done and not self.search_results.get_children():
+            self.search_results.insert('', 'end', text="No results.", tags=('placeholder',))
+
+    def on_search_result_activated(self, event=None):
+        item_id = self.search_results.focus()
+        values = self.search_results.item(item_id, 'values') if item_id else ()
+        if len(values) == 4: self.open_file(values[0], int(values[1]), int(values[2]), int(values[3]))
+        elif values: self.open_file(values[0])
+
+    def replace_all(self):
+        query, replacement, case_sensitive = self.search_query.get(), self.replace_text.get(), self.search_case.get()
+        if not (query and self.search_index and self.search_index.ready.is_set()): return
+        # A loading editor would finish with the old text and a later save would undo the replacement on disk
+        loading = [tab_frame for tab_frame in self.open_tabs.values() if getattr(tab_frame, 'editor', None) is not None and tab_frame.loading]
+        if loading:
+            messagebox.showinfo("Replace All", f"Wait until {len(loading)} file(s) have finished loading."); return
+        if not messagebox.askyesno("Replace All", f"Replace '{query}' with '{replacement}' in all project files?"): return
+        # Files open in an editor are changed there, so their unsaved edits are kept; the rest on disk
+        pattern = re.compile(re.escape(query), 0 if case_sensitive else re.IGNORECASE)
+        in_editors, skip = 0, set()
+        for file_path, tab_frame in self.open_tabs.items():
+            editor = getattr(tab_frame, 'editor', None)
+            if editor is None and getattr(tab_frame, 'saved_state', None): # Unloaded; change the kept text
+                skip.add(file_path)
+                text, count = pattern.subn(lambda m: replacement, tab_frame.saved_state['text'])
+                if count:
+                    tab_frame.saved_state.update(text=text, dirty=True); self.set_tab_title(tab_frame)
+                    in_editors += count
+                continue
+            if editor is None: continue # Memory-mapped viewer
+            skip.add(file_path)
+            text, count = pattern.subn(lambda m: replacement, editor.get('1.0', 'end-1c'))
+            if not count: continue
+            editor.edit_separator(); editor.delete('1.0', 'end'); editor.insert('1.0', text); editor.edit_separator()
+            if tab_frame.highlighter: tab_frame.highlighter.highlight() # delete/insert dropped every tag
+            in_editors += count
+        def worker():
+            counts = self.search_index.replace(query, replacement, case_sensitive, skip)
+            self.after(0, self._on_replace_finished, in_editors + sum(counts.values()), len(counts))
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_replace_finished(self, occurrences, files):
+        self.log_to_console(f"Replaced {occurrences} occurrence(s); {files} file(s) changed on disk.")
+        self.run_search()
+
+    def _on_file_load_failed(self, file_path, message):
+        tab_frame = self.open_tabs.get(file_path)
+        if tab_frame is not None: self._discard_tab(tab_frame)
+        messagebox.showerror("Error", f"Could not open file:\n{message}")
+
     def update_action_states(self):
         project_loaded = self.current_project_path is not None
         state = 'normal' if project_loaded else 'disabled'
         self.play_button.config(state=state)
         self.build_button.config(state=state)
+        self.validate_button.config(state=state)
 
     def play_project(self):
         if not self.current_project_path: return
-        index_path = Path(self.current_project_path) / "src" / "index.html"
-        if index_path.exists():
-            webbrowser.open(index_path.resolve().as_uri())
-        else:
+        src_path = Path(self.current_project_path) / "src"
+        if not (src_path / "index.html").exists():
             self.log_to_console("Error: 'src/index.html' not found.")
+            return
+        # A page that is already open just reloads instead of getting another browser tab
+        if self.dev_server and self.dev_server.has_clients():
+            self.dev_server.broadcast("reload")
+            return
+        if self.dev_server is None:
+            self.dev_server = bws_core.DevServer(src_path, watcher=self.watcher)
+            self.dev_server.start()
+            self.log_to_console(f"Live preview running at {self.dev_server.url}")
+        webbrowser.open(self.dev_server.url)
 
     def build_project(self):
-        if not self.current_project_path: return
-        
-        self.log_to_console("Starting build process...")
-        self.build_button.config(state='disabled')
-        
-        thread = threading.Thread(target=self._run_build_process, daemon=True)
-        thread.start()
-
-    def _run_build_process(self):
+        if not self.build_scheduler: return
+        # Clicks while a build runs are folded into one follow-up build
+        if not self.build_scheduler.busy: self.log_to_console("Starting build process...")
+        self.cancel_button.config(state='normal')
+        self.build_scheduler.request()
+
+    def cancel_build(self):
+        if self.build_scheduler and self.build_scheduler.cancel(): self.log_to_console("Cancelling build...")
+
+    def _on_build_finished(self, build):
+        if not build.queued: self.cancel_button.config(state='disabled')
+
+    def validate_project(self):
+        """Checks links and assets on a worker thread; a request during a run is folded into one more run."""
+        if not self.site_validator: return
+        if self.validation_running:
+            self.validation_again = True; return
+        self.validation_running = True
+        threading.Thread(target=self._run_validation, args=(self.site_validator,), daemon=True).start()
+
+    def _run_validation(self, validator):
+        try: report = validator.validate()
+        except Exception as e: report = e
+        self.after(0, self._on_validation_finished, validator, report)
+
+    def _on_validation_finished(self, validator, report):
+        self.validation_running = False
+        if isinstance(report, Exception): self.log_to_console(f"Validation failed: {report}")
+        else:
+            for line in bws_core.format_validation(report, validator.project_path): self.log_to_console(line)
+        if self.validation_again:
+            self.validation_again = False; self.validate_project()
+
+    def show_performance(self):
+        """Opens (or raises) the performance panel: time per instrumented path, stalls and trace export."""
+        if self.performance_window and self.performance_window.winfo_exists():
+            self.performance_window.lift(); return
+        window = self.performance_window = Toplevel(self, bg="#2b2b2b")
+        window.title("Performance"); window.geometry("640x360")
+        columns = ("count", "total", "mean", "max")
+        table = ttk.Treeview(window, columns=columns)
+        table.heading('#0', text="Path"); table.column('#0', width=220)
+        for column, title in zip(columns, ("Calls", "Total ms", "Mean ms", "Max ms")):
+            table.heading(column, text=title); table.column(column, width=90, anchor='e')
+        buttons = ttk.Frame(window)
+        window.stalls = ttk.Label(buttons)
+        window.stalls.pack(side='left', padx=4)
+        ttk.Button(buttons, text="Export Trace...", command=self.export_trace).pack(side='right', padx=2, pady=2)
+        ttk.Button(buttons, text="Reset", command=PERFORMANCE.reset).pack(side='right', padx=2, pady=2)
+        buttons.pack(side='bottom', fill='x')
+        table.pack(fill='both', expand=True)
+        window.table = table
+        self._refresh_performance()
+
+    def _refresh_performance(self):
+        window = self.performance_window
+        if not (window and window.winfo_exists()): return
+        window.table.delete(*window.table.get_children())
+        for name, *values in bws_core.format_performance(PERFORMANCE): window.table.insert('', 'end', text=name, values=values)
+        window.stalls.config(text=f"Stalls over {PERFORMANCE.stall_threshold * 1000:.0f} ms: {PERFORMANCE.stalls}")
+        self.after(1000, self._refresh_performance)
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(title="Export Trace", defaultextension=".json", initialfile="bws-trace.json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if not path: return
         try:
-            command = ["npm", "run", "build"]
-            # Hide the console window on Windows
-            startupinfo = None
-            if sys.platform == "win32":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            
-            process = subprocess.Popen(
-                command,
-                cwd=self.current_project_path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8',
-                startupinfo=startupinfo
-            )
-
-            for line in iter(process.stdout.readline, ''):
-                self.log_to_console(line.strip())
-
-            process.stdout.close()
-            return_code = process.wait()
-
-            if return_code == 0:
-                self.log_to_console("\nBuild completed successfully.")
-            else:
-                self.log_to_console(f"\nBuild failed with exit code: {return_code}")
-
-        except FileNotFoundError:
-            self.log_to_console("\nError: 'npm' command not found. Is Node.js installed and in your PATH?")
-        except Exception as e:
-            self.log_to_console(f"\nAn unexpected error occurred during build: {e}")
-        finally:
-            self.after(100, lambda: self.build_button.config(state='normal'))
+            PERFORMANCE.export_trace(path)
+            self.log_to_console(f"Trace written to {path} (open it in chrome://tracing or ui.perfetto.dev).")
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not write the trace:\n{e}")
 
     def log_to_console(self, message):
-        def append():
-            self.output_console.config(state='normal')
-            self.output_console.insert('end', message + '\n')
-            self.output_console.see('end')
-            self.output_console.config(state='disabled')
-        # Schedule the GUI update on the main thread
-        self.after(0, append)
+        # Safe to call from worker threads: lines are buffered and the first one of a batch
+        # schedules a single flush on the main thread
+        if self.console_buffer.write(message):
+            self.after(self.CONSOLE_FLUSH_MS, self.flush_console)
+
+    @PERFORMANCE.timed("console flush")
+    def flush_console(self):
+        text = self.console_buffer.drain()
+        if not text: return
+        self.output_console.config(state='normal')
+        self.output_console.insert('end', text + '\n')
+        excess = int(self.output_console.index('end-1c').split('.')[0]) - 1 - self.CONSOLE_MAX_LINES
+        if excess > 0:
+            self.output_console.delete('1.0', f'{excess + 1}.0')
+        self.output_console.see('end')
+        self.output_console.config(state='disabled')
 
 if __name__ == "__main__":
+    trace_path = sys.argv[sys.argv.index("--trace") + 1] if "--trace" in sys.argv[1:-1] else None
     app = BasicWebsiteStudio()
     app.mainloop()
+    if trace_path: PERFORMANCE.export_trace(trace_path)
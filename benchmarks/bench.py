@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import importlib.util
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import bws_core
+
+# Reproducible benchmarks for Basic Website Studio. A synthetic project is generated in the
+# layout of ProjectWizard.accept (bws_core.create_project), then the shared core is measured
+# headless and each GUI edition that can start here: Tkinter needs a display (run under
+# `xvfb-run` on servers), PySide6 falls back to its offscreen platform. Results are written
+# as JSON; --compare reports changes against an earlier run.
+#
+#   python3 benchmarks/bench.py --output before.json
+#   python3 benchmarks/bench.py --output after.json --compare before.json
+
+# --- Synthetic Projects ---
+WORDS = ("studio", "website", "layout", "header", "content", "gallery", "section", "button", "footer", "theme",
+         "preview", "build", "asset", "script", "style", "project", "editor", "console", "panel", "item")
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def _page(rng, title, depth, paragraphs):
+    up = "../" * depth
+    body = "\n".join(f'    <section id="s{i}" class="{rng.choice(WORDS)}">\n        <h2>{_sentence(rng, 4)}</h2>\n'
+                     f'        <p>{_sentence(rng)} <a href="{up}index.html#top">{rng.choice(WORDS)}</a></p>\n'
+                     f'        <img src="{up}../assets/images/img{rng.randrange(20)}.png" alt="{rng.choice(WORDS)}">\n    </section>'
+                     for i in range(paragraphs))
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n    <meta charset="UTF-8">\n    <title>{title}</title>\n'
+            f'    <link rel="stylesheet" href="{up}css/style.css">\n    <!-- {_sentence(rng, 6)} -->\n</head>\n<body>\n{body}\n'
+            f'    <script src="{up}js/main.js"></script>\n</body>\n</html>\n')
+
+def _stylesheet(rng, rules):
+    return "\n".join(f".{rng.choice(WORDS)}-{i} {{\n    color: #{rng.randrange(0x1000000):06x};\n    margin: {rng.randrange(40)}px;\n}}"
+                     for i in range(rules)) + "\n"
+
+def _script(rng, functions):
+    return "\n".join(f"function {rng.choice(WORDS)}{i}(value) {{\n    // {_sentence(rng, 5)}\n"
+                     f"    return value * {rng.randrange(100)} + '{rng.choice(WORDS)}';\n}}" for i in range(functions)) + "\n"
+
+def generate_project(parent, files=2000, depth=6, packages=300, big_html_mb=4.0, seed=1):
+    """Creates parent/bench-site: the wizard's files plus `files` pages, stylesheets and scripts
+    spread over folders up to `depth` levels deep, a fake node_modules with `packages` packages,
+    a long page (src/long.html) for highlighting and a big_html_mb page (src/big.html)."""
+    rng = random.Random(seed)
+    project = bws_core.create_project(parent, "bench-site")
+    src = os.path.join(project, "src")
+    for i in range(20):
+        with open(os.path.join(project, "assets", "images", f"img{i}.png"), "wb") as f: f.write(rng.randbytes(2048))
+    for i in range(files):
+        level = i % (depth + 1)
+        folder = os.path.join(src, "pages", *(f"section{(i >> (2 * n)) % 4}" for n in range(level)))
+        os.makedirs(folder, exist_ok=True)
+        kind = i % 5
+        if kind < 3: name, text = f"page{i}.html", _page(rng, f"Page {i}", level + 1, 8)
+        elif kind == 3: name, text = f"style{i}.css", _stylesheet(rng, 30)
+        else: name, text = f"script{i}.js", _script(rng, 15)
+        with open(os.path.join(folder, name), "w", encoding="utf-8") as f: f.write(text)
+    # Ignored by default, but as large as in real projects
+    for i in range(packages):
+        package = os.path.join(project, "node_modules", f"package-{i}", "lib")
+        os.makedirs(package, exist_ok=True)
+        for j in range(10):
+            with open(os.path.join(package, f"module{j}.js"), "w", encoding="utf-8") as f: f.write(_script(rng, 3))
+    with open(os.path.join(src, "long.html"), "w", encoding="utf-8") as f: f.write(_page(rng, "Long page", 0, 1500))
+    with open(os.path.join(src, "big.html"), "w", encoding="utf-8") as f:
+        chunk = _page(rng, "Big page", 0, 200)
+        f.write(chunk * max(1, int(big_html_mb * 1024 * 1024 / len(chunk))))
+    return project
+
+# --- Measuring ---
+class Results:
+    """Collects {name: {"value", "unit", "better"}}; timings are the median of `repeat` runs."""
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.values = {}
+        self.skipped = {}
+
+    def add(self, name, value, unit="ms", better="lower"):
+        self.values[name] = {"value": round(value, 3), "unit": unit, "better": better}
+        print(f"  {name:<32} {value:12.2f} {unit}")
+
+    def time(self, name, function, setup=None, repeat=None):
+        """Median wall time of function() in ms; setup() runs untimed before each run."""
+        samples = []
+        for _ in range(repeat or self.repeat):
+            if setup: setup()
+            started = time.perf_counter(); function()
+            samples.append((time.perf_counter() - started) * 1000)
+        self.add(name, statistics.median(samples))
+
+    def skip(self, suite, reason):
+        self.skipped[suite] = reason
+        print(f"  skipped: {reason}")
+
+def wait_until(condition, pump, timeout=120):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline: raise TimeoutError("benchmark step did not finish in time")
+        pump()
+
+# --- Core (headless) ---
+def bench_core(project, results, console_lines):
+    config = bws_core.load_project_config(project)
+    ignore = bws_core.ignore_globs(config)
+    builder = lambda: bws_core.ProjectBuilder(project, config)
+    clean = lambda: [shutil.rmtree(os.path.join(project, name), ignore_errors=True) for name in ("dist", "release", bws_core.CACHE_DIR)]
+    results.time("core.build_cold", lambda: builder().build(), setup=clean)
+    results.time("core.build_warm", lambda: builder().build())
+    stylesheet = os.path.join(project, "src", "css", "style.css")
+    results.time("core.build_one_change", lambda: builder().build(), setup=lambda: os.utime(stylesheet))
+    results.time("core.package", lambda: bws_core.ProductionPackager(project, config).package())
+
+    def scan():
+        watcher = bws_core.ProjectWatcher.for_project(project, config); watcher.start()
+        watcher.ready.wait(); watcher.stop(wait=True)
+    index_path = os.path.join(project, bws_core.CACHE_DIR, "index.json")
+    results.time("core.watcher_scan_cold", scan, setup=lambda: os.path.exists(index_path) and os.remove(index_path))
+    results.time("core.watcher_scan_warm", scan)
+
+    indexes, search_cache = [], os.path.join(project, bws_core.CACHE_DIR, bws_core.SEARCH_CACHE)
+    def new_index(cold):
+        if cold and os.path.exists(search_cache): os.remove(search_cache)
+        indexes.append(bws_core.SearchIndex(project, ignore))
+    results.time("core.search_index", lambda: indexes[-1].build(), setup=lambda: new_index(True))
+    results.time("core.search_index_warm", lambda: indexes[-1].build(), setup=lambda: new_index(False))
+    results.time("core.search_query", lambda: list(indexes[-1].search("gallery section")))
+    validator_cache = os.path.join(project, bws_core.CACHE_DIR, bws_core.VALIDATE_CACHE)
+    results.time("core.validate_cold", lambda: bws_core.SiteValidator(project, config).validate(),
+                 setup=lambda: os.path.exists(validator_cache) and os.remove(validator_cache))
+    results.time("core.validate_warm", lambda: bws_core.SiteValidator(project, config).validate())
+
+    buffer = bws_core.ConsoleBuffer()
+    started = time.perf_counter()
+    for i in range(console_lines):
+        if buffer.write(f"[build] line {i} of the benchmark output") and i: buffer.drain()
+    buffer.drain()
+    results.add("core.console_buffer_throughput", console_lines / (time.perf_counter() - started), "lines/s", "higher")
+
+# --- Tkinter Edition ---
+def bench_tk(project, results, keystrokes, console_lines):
+    try:
+        import tkinter
+        tkinter.Tk().destroy()
+    except Exception as e:
+        results.skip("tk", f"Tkinter cannot start here ({e}); run under xvfb-run"); return
+    spec = importlib.util.spec_from_file_location("bws_tk", os.path.join(ROOT, "Linux", "main.py"))
+    module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module)
+    app = module.BasicWebsiteStudio()
+    app.update()
+    try:
+        # load_project also starts the preview; the benchmarks drive the parts they measure directly
+        app.ignore_globs = bws_core.ignore_globs(bws_core.load_project_config(project))
+        results.time("tk.tree_root", lambda: app.populate_project_view(project))
+        def expand_all():
+            app.populate_project_view(project)
+            pending = [os.path.abspath(project)]
+            while pending:
+                folder = pending.pop()
+                for child in app.project_view.get_children(folder):
+                    if os.path.isdir(child):
+                        app.project_view.delete(*app.project_view.get_children(child))
+                        app.process_directory(child, child); pending.append(child)
+        results.time("tk.tree_full", expand_all)
+
+        def open_file(path):
+            def run():
+                app.open_file(path)
+                tab_frame = app.open_tabs[path]
+                wait_until(lambda: not tab_frame.loading, app.update)
+            return run
+        close_all = lambda: [app._discard_tab(tab_frame) for tab_frame in list(app.open_tabs.values())]
+        for name, file_name in (("tk.open_page", "index.html"), ("tk.open_long", "long.html"), ("tk.open_big", "big.html")):
+            results.time(name, open_file(os.path.join(project, "src", file_name)), setup=close_all)
+        close_all()
+
+        # The work a keystroke triggers once typing pauses, on a highlighted long page
+        editor = tkinter.Text(app); editor.pack()
+        with open(os.path.join(project, "src", "long.html"), encoding="utf-8") as f: editor.insert("1.0", f.read())
+        highlighter = module.SimpleSyntaxHighlighter(editor)
+        last_line = highlighter._last_line()
+        results.time("tk.highlight_full", lambda: highlighter.highlight_lines(1, last_line), repeat=1)
+        editor.mark_set("insert", f"{last_line // 2}.10")
+        samples = []
+        for i in range(keystrokes):
+            editor.insert("insert", "<b>" if i % 10 == 0 else "a")
+            started = time.perf_counter()
+            highlighter.on_key_release(); highlighter._flush_dirty()
+            samples.append((time.perf_counter() - started) * 1000)
+        results.add("tk.highlight_keystroke", statistics.median(samples))
+        highlighter.cancel(); editor.destroy()
+
+        started = time.perf_counter()
+        for i in range(console_lines):
+            app.log_to_console(f"[build] line {i} of the benchmark output")
+            if i % 1000 == 999: app.flush_console(); app.update_idletasks()
+        app.flush_console(); app.update_idletasks()
+        results.add("tk.console_throughput", console_lines / (time.perf_counter() - started), "lines/s", "higher")
+    finally:
+        app.on_close()
+
+# --- PySide6 Edition ---
+def bench_qt(project, results, keystrokes, console_lines):
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtWidgets import QApplication, QPlainTextEdit, QPlainTextDocumentLayout
+        from PySide6.QtGui import QTextDocument, QTextCursor
+        import BasicWebsiteStudio as module
+    except ImportError as e:
+        results.skip("qt", f"PySide6 is not available ({e})"); return
+    app = QApplication.instance() or QApplication([])
+    window = module.BasicWebsiteStudio()
+    window.show(); app.processEvents()
+    try:
+        window.fs_proxy.configure(project, bws_core.ignore_globs(bws_core.load_project_config(project)))
+        window.current_project_path = project
+        def populate():
+            window.tree_started = time.perf_counter()
+            root_index = window.fs_model.setRootPath(project)
+            if window.project_view.model() is None: window.project_view.setModel(window.fs_proxy)
+            window.project_view.setRootIndex(window.fs_proxy.mapFromSource(root_index))
+            wait_until(lambda: window.tree_started is None, app.processEvents)
+        # QFileSystemModel keeps what it listed, so only the first population is representative
+        results.time("qt.tree_root", populate, repeat=1)
+
+        def open_file(path):
+            def run():
+                window.open_file(path)
+                editor = window.find_tab(path)
+                wait_until(lambda: not editor.isReadOnly(), app.processEvents)
+            return run
+        def close_all():
+            while window.editor_tabs.count(): window._discard_tab(0)
+            app.processEvents()
+        for name, file_name in (("qt.open_page", "index.html"), ("qt.open_long", "long.html"), ("qt.open_big", "big.html")):
+            results.time(name, open_file(os.path.join(project, "src", file_name)), setup=close_all)
+        close_all()
+
+        # Typing into a highlighted document re-highlights synchronously from the edited block on
+        document = QTextDocument(); document.setDocumentLayout(QPlainTextDocumentLayout(document))
+        long_path = os.path.join(project, "src", "long.html")
+        with open(long_path, encoding="utf-8") as f: document.setPlainText(f.read())
+        highlighter = module.SimpleSyntaxHighlighter(document, long_path)
+        results.time("qt.highlight_full", highlighter.rehighlight, repeat=1)
+        cursor = QTextCursor(document.findBlockByNumber(document.blockCount() // 2)); cursor.movePosition(QTextCursor.EndOfBlock)
+        samples = []
+        for i in range(keystrokes):
+            started = time.perf_counter()
+            cursor.insertText("<b>" if i % 10 == 0 else "a")
+            samples.append((time.perf_counter() - started) * 1000)
+        results.add("qt.highlight_keystroke", statistics.median(samples))
+
+        started = time.perf_counter()
+        for i in range(console_lines):
+            window.log_to_console(f"[build] line {i} of the benchmark output")
+            if i % 1000 == 999: window.flush_console(); app.processEvents()
+        window.flush_console(); app.processEvents()
+        results.add("qt.console_throughput", console_lines / (time.perf_counter() - started), "lines/s", "higher")
+    finally:
+        window.close(); app.processEvents()
+
+# --- Reporting ---
+def metadata(args):
+    try: commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError: commit = ""
+    return {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": platform.python_version(),
+            "platform": platform.platform(), "cpus": os.cpu_count(),
+            "parameters": {name: getattr(args, name) for name in ("files", "depth", "packages", "big_html_mb", "seed",
+                                                                   "repeat", "keystrokes", "console_lines")}}
+
+def compare(previous, current, threshold):
+    """Prints each shared result against the previous run; returns the number of regressions."""
+    regressions = 0
+    print(f"\nCompared with {previous['meta'].get('commit') or 'previous run'} ({previous['meta'].get('time')}):")
+    for name, result in current["results"].items():
+        old = previous["results"].get(name)
+        if not old or not old["value"]: continue
+        change = result["value"] / old["value"] - 1
+        worse = change > threshold if result["better"] == "lower" else change < -threshold
+        regressions += worse
+        print(f"  {name:<32} {old['value']:12.2f} -> {result['value']:12.2f} {result['unit']:<8} {change * 100:+6.1f}%"
+              + ("  REGRESSION" if worse else ""))
+    if previous["meta"].get("parameters") != current["meta"]["parameters"]:
+        print("  note: the runs used different parameters")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Basic Website Studio on a generated project.")
+    parser.add_argument("--files", type=int, default=2000, help="pages, stylesheets and scripts to generate")
+    parser.add_argument("--depth", type=int, default=6, help="deepest folder level under src/pages")
+    parser.add_argument("--packages", type=int, default=300, help="fake node_modules packages (10 files each)")
+    parser.add_argument("--big-html-mb", type=float, default=4.0, help="size of src/big.html")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per timing; the median is reported")
+    parser.add_argument("--keystrokes", type=int, default=200)
+    parser.add_argument("--console-lines", type=int, default=50000)
+    parser.add_argument("--suites", default="core,tk,qt", help="comma-separated: core, tk, qt")
+    parser.add_argument("--workdir", help="where to generate the project (default: a temporary folder, removed afterwards)")
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bws-bench-")
+    try:
+        started = time.perf_counter()
+        shutil.rmtree(os.path.join(workdir, "bench-site"), ignore_errors=True)
+        project = generate_project(workdir, args.files, args.depth, args.packages, args.big_html_mb, args.seed)
+        print(f"Generated {project} in {time.perf_counter() - started:.1f} s")
+        results = Results(args.repeat)
+        suites = {"core": lambda: bench_core(project, results, args.console_lines),
+                  "tk": lambda: bench_tk(project, results, args.keystrokes, args.console_lines),
+                  "qt": lambda: bench_qt(project, results, args.keystrokes, args.console_lines)}
+        for suite in args.suites.split(","):
+            print(f"{suite}:"); suites[suite.strip()]()
+    finally:
+        if not args.workdir: shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"meta": metadata(args), "results": results.values, "skipped": results.skipped}
+    with open(args.output, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f: previous = json.load(f)
+        return 1 if compare(previous, report, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
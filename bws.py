@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import shutil
+import argparse
+
+import bws_core
+
+# Headless command line for Basic Website Studio projects. It only imports bws_core and the
+# standard library, never PySide6 or tkinter, so it runs on CI machines without a GUI stack.
+
+def build_one(project_path, jobs=None):
+    """Builds one project; returns (project path, report or error message). Runs in worker processes."""
+    try:
+        report = bws_core.ProjectBuilder(project_path, jobs=jobs).build()
+        return project_path, report
+    except Exception as e:
+        return project_path, str(e)
+
+def check_projects(paths):
+    """Prints an error and returns False unless every path is a project folder (has project.bws)."""
+    for project_path in paths:
+        if not os.path.isfile(os.path.join(project_path, "project.bws")):
+            print(f"{project_path}: not a valid project folder (project.bws is missing).", file=sys.stderr)
+            return False
+    return True
+
+def command_new(args):
+    project_path = bws_core.create_project(args.path, args.name)
+    print(f"Created project at {project_path}")
+    return 0
+
+def command_build(args):
+    if not check_projects(args.projects): return 2
+    if args.watch: return watch_build(args.projects[0])
+    started = time.perf_counter()
+    if len(args.projects) == 1:
+        # A single project parallelises over its files instead
+        results = [build_one(args.projects[0], args.jobs)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(build_one, args.projects, [1] * len(args.projects)))
+
+    failed = 0
+    for project_path, report in results:
+        if isinstance(report, str) or report.errors:
+            failed += 1
+            for error in [report] if isinstance(report, str) else report.errors:
+                print(f"{project_path}: error: {error}", file=sys.stderr)
+        else:
+            print(f"{project_path}: built {report.built}, unchanged {report.unchanged}, "
+                  f"removed {report.removed} in {report.seconds * 1000:.0f} ms")
+    if len(results) > 1:
+        print(f"{len(results) - failed}/{len(results)} project(s) built in {time.perf_counter() - started:.2f} s")
+    return 1 if failed else 0
+
+def watch_build(project_path):
+    """Builds once, then again whenever the project changes; changes during a build coalesce into one rebuild."""
+    config = bws_core.load_project_config(project_path)
+    scheduler = bws_core.BuildScheduler(project_path, config, log=print)
+    watcher = bws_core.ProjectWatcher.for_project(project_path, config)
+    # Writes into the build and package output folders must not trigger another build, whatever they are called
+    outputs = [bws_core.ProjectBuilder(project_path, config).output]
+    try: outputs.append(bws_core.ProductionPackager(project_path, config).output)
+    except ValueError: pass # Reported by the build that runs the packager
+    outputs = tuple(os.path.realpath(output) + os.sep for output in outputs)
+    watcher.subscribe(lambda events: any(not (os.path.realpath(event.new_path or event.path) + os.sep).startswith(outputs)
+                                         for event in events)
+                      and scheduler.request())
+    watcher.start(); scheduler.request()
+    print("Watching for changes (Ctrl+C to stop)")
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt:
+        scheduler.stop(); watcher.stop(wait=True)
+    return 0
+
+def command_serve(args):
+    if not check_projects([args.project]): return 2
+    server = bws_core.DevServer(os.path.join(args.project, "src"), host=args.host, port=args.port)
+    print(f"Serving {os.path.join(args.project, 'src')} at {server.start()} (Ctrl+C to stop)")
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+def command_validate(args):
+    if not check_projects(args.projects): return 2
+    issues = 0
+    for project_path in args.projects:
+        report = bws_core.SiteValidator(project_path, jobs=args.jobs).validate()
+        for line in bws_core.format_validation(report, project_path): print(f"{project_path}: {line}")
+        issues += len(report.issues)
+    return 1 if issues else 0
+
+def command_package(args):
+    if not check_projects(args.projects): return 2
+    failed = 0
+    for project_path in args.projects:
+        try:
+            report = bws_core.ProjectBuilder(project_path, jobs=args.jobs).build()
+            for error in report.errors: print(f"{project_path}: error: {error}", file=sys.stderr)
+            if report.errors:
+                failed += 1; continue
+            bws_core.ProductionPackager(project_path, jobs=args.jobs, log=lambda line: print(f"{project_path}: {line}")).package()
+        except ValueError as e:
+            print(f"{project_path}: error: {e}", file=sys.stderr); failed += 1
+    return 1 if failed else 0
+
+def command_clean(args):
+    if not check_projects(args.projects): return 2
+    failed = 0
+    for project_path in args.projects:
+        builder = bws_core.ProjectBuilder(project_path)
+        folders = [os.path.join(builder.project_path, bws_core.CACHE_DIR)]
+        try:
+            # Only folders strictly inside the project that are not inputs; "" or ".." would remove the project
+            output = bws_core.checked_output_folder(builder.project_path, builder.config.get("build", {}).get("output", "dist"), builder.inputs)
+            folders.insert(0, output)
+            package_output = bws_core.ProductionPackager(project_path, builder.config).output
+            if os.path.isfile(os.path.join(package_output, bws_core.PACKAGE_MANIFEST)): folders.insert(1, package_output)
+        except ValueError as e:
+            print(f"{project_path}: error: {e}", file=sys.stderr); failed += 1
+        for path in folders:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+                print(f"Removed {path}")
+    return 1 if failed else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="bws", description="Create, build and serve Basic Website Studio projects.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    new = commands.add_parser("new", help="create a new project")
+    new.add_argument("name")
+    new.add_argument("--path", default=".", help="folder to create the project in (default: current folder)")
+    new.set_defaults(handler=command_new)
+
+    build = commands.add_parser("build", help="build one or more projects into their output folder")
+    build.add_argument("projects", nargs="+")
+    build.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    build.add_argument("-w", "--watch", action="store_true", help="keep running and rebuild the (first) project on changes")
+    build.set_defaults(handler=command_build)
+
+    serve = commands.add_parser("serve", help="serve a project's src/ folder with live reload")
+    serve.add_argument("project", nargs="?", default=".")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.set_defaults(handler=command_serve)
+
+    validate = commands.add_parser("validate", help="check pages and stylesheets for broken links, anchors and oversized assets")
+    validate.add_argument("projects", nargs="+")
+    validate.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    validate.set_defaults(handler=command_validate)
+
+    package = commands.add_parser("package", help="build, then fingerprint, inline and gzip the output for production")
+    package.add_argument("projects", nargs="+")
+    package.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    package.set_defaults(handler=command_package)
+
+    clean = commands.add_parser("clean", help="remove build and package output and build caches")
+    clean.add_argument("projects", nargs="+")
+    clean.set_defaults(handler=command_clean)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
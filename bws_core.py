@@ -0,0 +1,1912 @@
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import queue
+import hashlib
+import functools
+import fnmatch
+import posixpath
+import mimetypes
+import threading
+from collections import defaultdict, deque, namedtuple
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+# GUI-free building blocks shared by the PySide6 and Tkinter editions and the bws CLI.
+# Only the Python standard library may be imported here; heavier modules (http.server,
+# concurrent.futures) are imported where they are used to keep CLI start-up fast.
+
+# Folders hidden from the explorer (and ignored by the watcher) unless project.bws defines its own "ignore" list
+DEFAULT_IGNORE_GLOBS = ["node_modules", ".git", "dist", "release", ".bws"]
+CACHE_DIR = ".bws" # Per-project caches (build manifest, project index), next to project.bws
+
+# --- Project Configuration ---
+def load_project_config(project_path):
+    """Reads project.bws; returns an empty dict if it is missing or not a JSON object."""
+    try:
+        with open(Path(project_path) / "project.bws", "r", encoding="utf-8") as f: config = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return config if isinstance(config, dict) else {}
+
+def ignore_globs(config):
+    return list(config.get("ignore", DEFAULT_IGNORE_GLOBS))
+
+def is_ignored(name, globs):
+    return _ignore_pattern(tuple(globs)).match(name) is not None
+
+@functools.lru_cache(maxsize=16)
+def _ignore_pattern(globs):
+    # One compiled regex per glob list; fnmatch would re-check every pattern for every name
+    return re.compile("|".join(fnmatch.translate(glob) for glob in globs) or "(?!)")
+
+# --- Project Scaffolding ---
+def create_project(parent_path, project_name):
+    """Creates the standard project layout with default files; returns the project path."""
+    full_path = Path(parent_path) / project_name
+    # Create directory structure
+    os.makedirs(full_path / "src" / "js", exist_ok=True)
+    os.makedirs(full_path / "src" / "css", exist_ok=True)
+    os.makedirs(full_path / "assets" / "images", exist_ok=True)
+
+    # Create default files
+    (full_path / "src" / "index.html").write_text(f"<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n    <meta charset=\"UTF-8\">\n    <title>{project_name}</title>\n    <link rel=\"stylesheet\" href=\"css/style.css\">\n</head>\n<body>\n    <h1>Welcome to {project_name}</h1>\n    <script src=\"js/main.js\"></script>\n</body>\n</html>", encoding="utf-8")
+    (full_path / "src" / "css" / "style.css").write_text("body {\n    font-family: sans-serif;\n    background-color: #f0f0f0;\n    color: #111;\n}", encoding="utf-8")
+    (full_path / "src" / "js" / "main.js").write_text("console.log('Project loaded successfully!');", encoding="utf-8")
+
+    # Create project config file
+    project_config = {"name": project_name, "version": "1.0.0"}
+    with open(full_path / "project.bws", "w", encoding="utf-8") as f: json.dump(project_config, f, indent=4)
+    return str(full_path)
+
+# --- Large Files ---
+LARGE_FILE_SIZE = 1024 * 1024      # From this size on, editors skip syntax highlighting and word wrap
+HUGE_FILE_SIZE = 16 * 1024 * 1024  # From this size on, files open in a read-only MappedTextFile viewer
+LOAD_CHUNK_LINES = 5000            # Lines inserted into an editor per main-loop turn while loading
+
+def read_text_file(path):
+    with open(path, "r", encoding="utf-8") as f: return f.read()
+
+_UMASK = os.umask(0); os.umask(_UMASK) # Read once; new files written through mkstemp get the usual permissions
+
+def detect_newline(path):
+    """"\r\n" if the file's first line ends in CRLF, else "\n" (also for missing files)."""
+    try:
+        with open(path, "rb") as f: head = f.read(64 * 1024)
+    except OSError:
+        return "\n"
+    end = head.find(b"\n")
+    return "\r\n" if end > 0 and head[end - 1] == 0x0D else "\n"
+
+def write_text_file(path, text, newline=None):
+    """Writes through a temporary file and os.replace, so readers never see a half-written file.
+
+    Symlinks are followed and an existing file keeps its permissions. Editor text ("\n" line
+    ends, see read_text_file) is written with the line ends the file already uses;
+    newline="" writes text exactly as given.
+    """
+    import shutil, tempfile
+    path = os.path.realpath(path)
+    if newline is None: newline = detect_newline(path)
+    if newline == "\r\n": text = text.replace("\r\n", "\n").replace("\n", "\r\n")
+    # A unique temporary file per write: the save engine and Replace All may write the same file at once
+    descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".bws-", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8", newline="") as f: f.write(text)
+        if os.path.exists(path): shutil.copymode(path, temp_path)
+        else: os.chmod(temp_path, 0o666 & ~_UMASK)
+        os.replace(temp_path, path)
+    except BaseException:
+        try: os.remove(temp_path)
+        except OSError: pass
+        raise
+
+def split_into_chunks(text, lines=LOAD_CHUNK_LINES):
+    """Splits text at line boundaries into pieces of at most the given number of lines."""
+    all_lines = text.splitlines(keepends=True)
+    return ["".join(all_lines[i:i + lines]) for i in range(0, len(all_lines), lines)] or [""]
+
+class MappedTextFile:
+    """Read-only, mmap-backed access to a file too large to load into an editor widget.
+
+    Pages are byte ranges aligned to line starts, so only the part being looked at is
+    ever decoded. Lines longer than a page (minified bundles) are split.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.size = os.fstat(f.fileno()).st_size
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+    def page(self, offset, size=256 * 1024):
+        """Returns (start, end, text) for about size bytes beginning at the line containing offset."""
+        offset = max(0, min(offset, self.size))
+        newline = self.data.rfind(b"\n", max(0, offset - size), offset) if offset else -1
+        # Without a newline in the window (one long line) the page starts at offset itself
+        start = newline + 1 if newline >= 0 or not offset else offset
+        end = min(start + size, self.size)
+        if end < self.size:
+            newline = self.data.find(b"\n", end, end + size)
+            if newline >= 0: end = newline + 1
+        return start, end, self.data[start:end].decode("utf-8", errors="replace")
+
+    def close(self):
+        if self.size: self.data.close()
+
+# --- Output Console Buffer ---
+class ConsoleBuffer:
+    """Thread-safe ring buffer of console lines waiting to be flushed into a widget.
+
+    Writers on any thread append lines; the GUI drains them in one batch. When more
+    than max_lines pile up between flushes the oldest are dropped and counted.
+    """
+    def __init__(self, max_lines=5000):
+        self.lines = deque(maxlen=max_lines)
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    def write(self, text):
+        """Queues text; returns True if the buffer was empty, i.e. the caller must schedule a flush."""
+        with self.lock:
+            was_empty = not self.lines and not self.dropped
+            for line in text.splitlines() or [""]:
+                if len(self.lines) == self.lines.maxlen: self.dropped += 1
+                self.lines.append(line)
+            return was_empty
+
+    def drain(self):
+        """Returns everything queued since the last drain as one string ("" if nothing)."""
+        with self.lock:
+            lines, dropped = list(self.lines), self.dropped
+            self.lines.clear(); self.dropped = 0
+        if dropped: lines.insert(0, f"... {dropped} lines skipped ...")
+        return "\n".join(lines)
+
+# --- Instrumentation ---
+TraceEvent = namedtuple("TraceEvent", "name category start duration thread args")
+
+class PerformanceMonitor:
+    """Times hot paths and main-loop stalls, and exports them as Chrome trace events.
+
+    Spans come from measure() and timed() and are summed up per name for a performance
+    panel. The GUI calls beat(interval) from a repeating main-loop timer; a beat that is
+    late by stall_threshold or more is recorded as an "event loop stall". While a beat is
+    overdue, a watchdog thread samples the main thread's stack, so the stall shows the code
+    that blocked the loop. Safe to use from any thread.
+    """
+    STALL_THRESHOLD = 0.1  # Seconds a beat may be late before it counts as a stall
+    MAX_EVENTS = 100000    # Trace events kept; older ones are dropped, the statistics keep counting
+
+    def __init__(self, stall_threshold=STALL_THRESHOLD, max_events=MAX_EVENTS):
+        self.stall_threshold = stall_threshold
+        self.origin = time.perf_counter() # Trace timestamps are relative to this
+        self.events = deque(maxlen=max_events)
+        self.stats = {} # name -> [count, total seconds, longest seconds]
+        self.stalls = 0
+        self._thread_names = {}
+        self._lock = threading.Lock()
+        self._last_beat = None
+        self._interval = 0.0
+        self._stack = None # Main-thread stack sampled during the current stall
+        self._main_thread = threading.main_thread().ident
+        self._stopped = threading.Event()
+        self._watchdog = None
+
+    def record(self, name, start, duration, category="app", **args):
+        """Adds a finished span; start is a time.perf_counter() value."""
+        thread = threading.current_thread()
+        with self._lock:
+            entry = self.stats.get(name)
+            if entry is None: self.stats[name] = [1, duration, duration]
+            else: entry[0] += 1; entry[1] += duration; entry[2] = max(entry[2], duration)
+            self.events.append(TraceEvent(name, category, start, duration, thread.ident, args))
+            self._thread_names[thread.ident] = thread.name
+
+    @contextmanager
+    def measure(self, name, category="app", **args):
+        start = time.perf_counter()
+        try: yield
+        finally: self.record(name, start, time.perf_counter() - start, category, **args)
+
+    def timed(self, name, category="app"):
+        """Decorator that records every call of the function as a span."""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try: return function(*args, **kwargs)
+                finally: self.record(name, start, time.perf_counter() - start, category)
+            return wrapper
+        return decorate
+
+    def beat(self, interval):
+        """Called from the main loop every interval seconds."""
+        now = time.perf_counter()
+        with self._lock:
+            last, stack = self._last_beat, self._stack
+            self._last_beat, self._interval, self._stack = now, interval, None
+        if last is None: return
+        late = now - last - interval
+        if late >= self.stall_threshold:
+            with self._lock: self.stalls += 1
+            self.record("event loop stall", last + interval, late, "stall", **({"stack": stack} if stack else {}))
+
+    def start_watchdog(self):
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+            self._watchdog.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _watch(self):
+        import traceback
+        while not self._stopped.wait(self.stall_threshold / 2):
+            with self._lock: last, interval, sampled = self._last_beat, self._interval, self._stack
+            if last is None or sampled is not None or time.perf_counter() - last - interval < self.stall_threshold: continue
+            frame = sys._current_frames().get(self._main_thread)
+            if frame is None: continue
+            stack = [f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}" for entry in traceback.extract_stack(frame)[-8:]]
+            with self._lock:
+                if self._last_beat == last: self._stack = stack # Still the same stall
+
+    def summary(self):
+        """[(name, count, total seconds, longest seconds)], most expensive first."""
+        with self._lock: rows = [(name, *entry) for name, entry in self.stats.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self.events.clear(); self.stats.clear(); self.stalls = 0
+
+    def chrome_trace(self):
+        """The recorded spans in Chrome's trace event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        with self._lock: events, names = list(self.events), dict(self._thread_names)
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}} for tid, name in names.items()]
+        trace += [{"name": event.name, "cat": event.category, "ph": "X", "pid": pid, "tid": event.thread,
+                   "ts": round((event.start - self.origin) * 1e6, 1), "dur": round(event.duration * 1e6, 1), "args": event.args}
+                  for event in events]
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def export_trace(self, path):
+        write_text_file(path, json.dumps(self.chrome_trace()))
+
+def format_performance(monitor):
+    """Rows for a performance panel: (name, count, total ms, mean ms, max ms) as strings."""
+    return [(name, str(count), f"{total * 1000:.1f}", f"{total * 1000 / count:.2f}", f"{longest * 1000:.1f}")
+            for name, count, total, longest in monitor.summary()]
+
+# --- Saving ---
+class SaveEngine:
+    """Writes editor buffers to disk from one background thread.
+
+    save() only records the latest text of a file, so rapid saves of the same file coalesce
+    into one write. A write is skipped when the text hashes the same as the file on disk,
+    and files are replaced atomically, so watchers, builds and the preview only see saves
+    that change something. on_saved(path, written, error) is called on the writer thread.
+    """
+    def __init__(self, on_saved=None):
+        self.on_saved = on_saved
+        self._pending = {}  # path -> latest text to write
+        self._known = {}    # path -> (hash, mtime_ns, size) of the file as last read or written
+        self._busy = False
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="SaveEngine", daemon=True)
+        self._thread.start()
+
+    def remember(self, path, text):
+        """Records the text a file was loaded with, so saving it unchanged costs no write."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._condition: self._known[path] = (hash_bytes(text.encode("utf-8")), stat.st_mtime_ns, stat.st_size)
+
+    def save(self, path, text):
+        with self._condition:
+            self._pending[path] = text
+            self._condition.notify()
+
+    def is_pending(self, path):
+        with self._condition: return path in self._pending
+
+    def flush(self, timeout=None):
+        """Blocks until every queued save has been handled; returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def stop(self, timeout=5.0):
+        """Writes what is still queued, then ends the writer thread."""
+        self.flush(timeout)
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopped)
+                if self._stopped and not self._pending: return
+                path, text = self._pending.popitem()
+                known = self._known.get(path)
+                self._busy = True
+            written, error = False, None
+            try:
+                written = self._write(path, text, known)
+            except (OSError, ValueError) as e:
+                error = e
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+            if self.on_saved: self.on_saved(path, written, error)
+
+    def _write(self, path, text, known):
+        data = text.encode("utf-8")
+        content_hash = hash_bytes(data)
+        try:
+            stat = os.stat(path)
+            if known is None or known[1:] != (stat.st_mtime_ns, stat.st_size): # Unknown or changed on disk since
+                known = (hash_bytes(read_text_file(path).encode("utf-8")), stat.st_mtime_ns, stat.st_size)
+            unchanged = known[0] == content_hash
+        except (OSError, UnicodeDecodeError):
+            unchanged = False
+        if not unchanged:
+            write_text_file(path, text)
+        stat = os.stat(path)
+        with self._condition: self._known[path] = (content_hash, stat.st_mtime_ns, stat.st_size)
+        return not unchanged
+
+# --- File System Watcher ---
+# kind is "created", "deleted", "modified" or "renamed"; new_path is only set for renames.
+FileEvent = namedtuple("FileEvent", "kind path is_dir new_path", defaults=(None,))
+
+class ProjectIndex:
+    """Sidecar index of every project file, persisted in .bws/index.json.
+
+    Holds size, mtime and inode per file and mtime and inode per folder,
+    with paths relative to the project, so a ProjectWatcher can resume from it instead
+    of walking the whole project again.
+    """
+    VERSION = 2
+
+    def __init__(self, project_path):
+        self.project_path = os.path.abspath(project_path)
+        self.path = os.path.join(self.project_path, CACHE_DIR, "index.json")
+
+    def load(self, ignore):
+        """Returns the stored index, or None if there is none or it was made with other ignore globs."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f: data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != self.VERSION or data.get("ignore") != list(ignore): return None
+        return data
+
+    def save(self, ignore, dirs, files):
+        """dirs: {relative path: [mtime_ns, inode]}, files: {relative path: [size, mtime_ns, inode]}."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": self.VERSION, "ignore": list(ignore), "dirs": dirs, "files": files}))
+        os.replace(temp_path, self.path)
+
+class ProjectWatcher:
+    """Polls a project tree with os.scandir snapshots and reports the differences.
+
+    Every poll stats each known directory and only re-lists those whose mtime changed, so
+    structural changes cost O(directories). Files replaced under the same name (atomic saves)
+    show up in that re-listing as a new inode. Other content changes are found by stat-ing
+    at most max_file_stats files per poll, round-robin. Listeners are called on the watcher thread
+    with a list of FileEvent; GUI code has to hand them over to its own main loop.
+
+    With a ProjectIndex the snapshot is restored from disk instead of walking the tree;
+    the regular polls then correct whatever changed while the project was closed. The index
+    is written back at most every SAVE_INTERVAL seconds and when the watcher stops. It holds
+    stat data only; the build manifest and the search index keep their own content data.
+    """
+    SAVE_INTERVAL = 5.0
+
+    def __init__(self, root, ignore=DEFAULT_IGNORE_GLOBS, interval=1.0, max_file_stats=2000, index=None):
+        self.root = os.path.abspath(root)
+        self.ignore = list(ignore)
+        self.interval = interval
+        self.max_file_stats = max_file_stats
+        self.index = index
+        self.listeners = []
+        self.ready = threading.Event() # Set once the initial snapshot exists
+        self._dirs = {}     # dir path -> (mtime_ns, set of child paths)
+        self._entries = {}  # path -> (is_dir, inode)
+        self._files = {}    # file path -> (mtime_ns, size)
+        self._file_queue = []
+        self._index_dirty = False
+        self._last_save = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def for_project(cls, project_path, config):
+        """Creates an indexed watcher using the "ignore" list and the "watch" settings of project.bws."""
+        watch = config.get("watch", {})
+        return cls(project_path, ignore_globs(config), interval=watch.get("interval", 1.0),
+                   max_file_stats=watch.get("max_file_stats", 2000), index=ProjectIndex(project_path))
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="ProjectWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=False):
+        """Stops polling; with wait, blocks (briefly) until the index has been written."""
+        self._stop.set()
+        if wait and self._thread: self._thread.join(timeout=2.0)
+
+    def files(self):
+        """Returns {file path: (mtime_ns, size)} as currently known."""
+        return dict(self._files)
+
+    def _run(self):
+        if not (self.index and self._restore_index()):
+            self._scan_dir(self.root, None)
+            self._index_dirty = True
+        self.ready.set()
+        while not self._stop.wait(self.interval):
+            events = self.poll()
+            if events:
+                self._index_dirty = True
+                for callback in list(self.listeners): callback(events)
+            if self.index: self._maintain_index()
+        if self.index and self._index_dirty: self._save_index()
+
+    def _restore_index(self):
+        data = self.index.load(self.ignore)
+        if data is None: return False
+        self._dirs[self.root] = (None, set())
+        for relative, (mtime, inode) in data["dirs"].items():
+            path = os.path.join(self.root, relative) if relative else self.root
+            self._dirs[path] = (mtime, set())
+            if relative: self._entries[path] = (True, inode)
+        for relative, (size, mtime, inode) in data["files"].items():
+            path = os.path.join(self.root, relative)
+            self._entries[path] = (False, inode)
+            self._files[path] = (mtime, size)
+        for path in self._entries:
+            parent = self._dirs.get(os.path.dirname(path))
+            if parent: parent[1].add(path)
+        return True
+
+    def _maintain_index(self):
+        if self._index_dirty and time.monotonic() - self._last_save >= self.SAVE_INTERVAL:
+            self._save_index()
+
+    def _save_index(self):
+        relative = lambda path: os.path.relpath(path, self.root)
+        dirs = {(relative(path) if path != self.root else ""): [mtime, self._entries.get(path, (True, 0))[1]]
+                for path, (mtime, _) in self._dirs.items()}
+        files = {relative(path): [signature[1], signature[0], self._entries[path][1]]
+                 for path, signature in self._files.items() if signature}
+        try:
+            self.index.save(self.ignore, dirs, files)
+            self._index_dirty = False
+        except OSError:
+            pass # Read-only project; the next run walks the tree again
+        self._last_save = time.monotonic()
+
+    def poll(self):
+        """Compares the tree with the last snapshot and returns the list of FileEvents."""
+        events, deleted_inodes = [], {}
+        for dir_path in list(self._dirs):
+            if dir_path not in self._dirs: continue # Dropped while rescanning its parent
+            try:
+                mtime = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                continue # The parent's rescan reports the removal
+            if mtime != self._dirs[dir_path][0]:
+                self._rescan_dir(dir_path, mtime, events, deleted_inodes)
+        self._check_files(events)
+        return self._pair_renames(events, deleted_inodes)
+
+    def _list_dir(self, path):
+        try:
+            with os.scandir(path) as it:
+                return {e.path: (e.is_dir(follow_symlinks=False), e.inode()) for e in it if not is_ignored(e.name, self.ignore)}
+        except OSError:
+            return {}
+
+    def _scan_dir(self, path, events):
+        """Records a directory subtree; with an events list, reports its top-level entries as created."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        children = self._list_dir(path)
+        self._dirs[path] = (mtime, set(children))
+        for child, (is_dir, inode) in children.items():
+            self._add_entry(child, is_dir, inode)
+            if events is not None: events.append(FileEvent("created", child, is_dir))
+
+    def _add_entry(self, path, is_dir, inode):
+        self._entries[path] = (is_dir, inode)
+        if is_dir:
+            self._scan_dir(path, None)
+        else:
+            self._files[path] = self._stat_file(path)
+
+    def _rescan_dir(self, path, mtime, events, deleted_inodes):
+        old_children = self._dirs[path][1]
+        children = self._list_dir(path)
+        self._dirs[path] = (mtime, set(children))
+        for child in old_children - set(children):
+            is_dir, deleted_inodes[child] = self._entries[child]
+            events.append(FileEvent("deleted", child, is_dir))
+            self._forget(child)
+        for child in set(children) - old_children:
+            is_dir, inode = children[child]
+            self._add_entry(child, is_dir, inode)
+            events.append(FileEvent("created", child, is_dir))
+        for child in set(children) & old_children:
+            # Atomic saves replace a file under the same name; only its inode tells
+            if children[child] == self._entries[child]: continue
+            is_dir, inode = children[child]
+            if is_dir or self._entries[child][0]:
+                events.append(FileEvent("deleted", child, self._entries[child][0]))
+                self._forget(child); self._add_entry(child, is_dir, inode)
+                events.append(FileEvent("created", child, is_dir))
+            else:
+                self._entries[child] = (is_dir, inode)
+                self._files[child] = self._stat_file(child)
+                events.append(FileEvent("modified", child, False))
+
+    def _forget(self, path):
+        is_dir, _ = self._entries.pop(path, (False, None))
+        self._files.pop(path, None)
+        if is_dir and path in self._dirs:
+            for child in self._dirs.pop(path)[1]: self._forget(child)
+
+    def _stat_file(self, path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _check_files(self, events):
+        for _ in range(min(self.max_file_stats, len(self._files))):
+            if not self._file_queue:
+                self._file_queue = list(self._files)
+            path = self._file_queue.pop()
+            if path not in self._files: continue
+            signature = self._stat_file(path)
+            if signature is not None and signature != self._files[path]:
+                self._files[path] = signature
+                events.append(FileEvent("modified", path, False))
+
+    def _pair_renames(self, events, deleted_inodes):
+        """Turns a deleted + created pair that shares an inode into a single renamed event."""
+        created = {}
+        for event in events:
+            inode = self._entries[event.path][1] if event.kind == "created" else None
+            if inode: created.setdefault(inode, event)
+        renamed = {} # new path -> old path
+        for event in events:
+            target = created.get(deleted_inodes.get(event.path)) if event.kind == "deleted" else None
+            if target and target.is_dir == event.is_dir and target.path not in renamed:
+                renamed[target.path] = event.path
+        if not renamed: return events
+        sources = set(renamed.values())
+        result = []
+        for event in events:
+            if event.kind == "created" and event.path in renamed:
+                result.append(FileEvent("renamed", renamed[event.path], event.is_dir, event.path))
+            elif not (event.kind == "deleted" and event.path in sources):
+                result.append(event)
+        return result
+
+# --- Dependency Graph ---
+CSS_URL_PATTERN = re.compile(r"""url\(\s*["']?([^"')]+?)["']?\s*\)|@import\s+["']([^"']+)["']""")
+JS_IMPORT_PATTERN = re.compile(r"""(?:\bimport\s*\(?|\bfrom)\s*["']([^"']+)["']""")
+URL_SCHEME_PATTERN = re.compile(r"^[a-zA-Z][\w+.-]*:|^//")
+
+class _ReferenceParser(HTMLParser):
+    """Collects the URLs an HTML page loads, including those in inline <style> blocks and style attributes."""
+    ATTRIBUTES = {"link": ("href",), "script": ("src",), "img": ("src", "srcset"), "source": ("src", "srcset")}
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+        self.in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if name == "style" and value: self.urls += css_references(value)
+            if not value or name not in self.ATTRIBUTES.get(tag, ()): continue
+            if name == "srcset": self.urls += [candidate.split()[0] for candidate in value.split(",") if candidate.strip()]
+            else: self.urls.append(value)
+        self.in_style = tag == "style"
+
+    def handle_endtag(self, tag):
+        if tag == "style": self.in_style = False
+
+    def handle_data(self, data):
+        if self.in_style: self.urls += css_references(data)
+
+def css_references(text):
+    return [url or imported for url, imported in CSS_URL_PATTERN.findall(text)]
+
+def extract_references(path, text, site_root):
+    """Returns the absolute paths of the local files an HTML, CSS or JS file references."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".html", ".htm"):
+        parser = _ReferenceParser(); parser.feed(text); parser.close()
+        urls = parser.urls
+    elif extension == ".css":
+        urls = css_references(text)
+    elif extension in (".js", ".mjs"):
+        # Bare specifiers ("lodash") are packages, not project files
+        urls = [url for url in JS_IMPORT_PATTERN.findall(text) if url.startswith((".", "/"))]
+    else:
+        return set()
+    return {resolved for resolved in (resolve_reference(url, path, site_root) for url in urls) if resolved}
+
+def resolve_reference(url, from_file, site_root):
+    """Maps a URL found in from_file to a local path, or None for external, data and fragment URLs."""
+    url = url.strip()
+    if not url or url.startswith(("#", "data:")) or URL_SCHEME_PATTERN.match(url): return None
+    url_path = unquote(url.split("#")[0].split("?")[0])
+    if not url_path: return None
+    base = site_root if url_path.startswith("/") else os.path.dirname(from_file)
+    return os.path.normpath(os.path.join(base, url_path.lstrip("/")))
+
+class DependencyGraph:
+    """Which local files each HTML/CSS/JS file references, and the reverse.
+
+    Files are re-parsed one at a time as they change, so the graph stays current without
+    rescanning the site. References to files that do not exist yet are kept, so creating
+    them later is also attributed to the right pages.
+    """
+    PARSED_EXTENSIONS = (".html", ".htm", ".css", ".js", ".mjs")
+
+    def __init__(self, site_root, ignore=DEFAULT_IGNORE_GLOBS):
+        self.site_root = os.path.abspath(site_root)
+        self.ignore = list(ignore)
+        self.forward = {}                  # file -> set of referenced paths
+        self.reverse = defaultdict(set)    # referenced path -> set of referencing files
+        self.lock = threading.Lock()
+
+    def scan(self):
+        for directory, dirs, names in os.walk(self.site_root):
+            dirs[:] = [d for d in dirs if not is_ignored(d, self.ignore)]
+            for name in names:
+                if name.lower().endswith(self.PARSED_EXTENSIONS): self.update(os.path.join(directory, name))
+
+    def update(self, path, text=None):
+        """Re-parses one file (from disk unless its text is given)."""
+        path = os.path.abspath(path)
+        if not path.lower().endswith(self.PARSED_EXTENSIONS): return
+        try:
+            references = extract_references(path, read_text_file(path) if text is None else text, self.site_root)
+        except (OSError, UnicodeDecodeError):
+            return self.remove(path)
+        with self.lock:
+            for old in self.forward.get(path, set()) - references: self.reverse[old].discard(path)
+            for new in references: self.reverse[new].add(path)
+            self.forward[path] = references
+
+    def remove(self, path):
+        path = os.path.abspath(path)
+        with self.lock:
+            for old in self.forward.pop(path, ()): self.reverse[old].discard(path)
+
+    def dependencies(self, path):
+        with self.lock: return set(self.forward.get(os.path.abspath(path), ()))
+
+    def dependents(self, path):
+        """All files that reference path, directly or through other files."""
+        result, frontier = set(), {os.path.abspath(path)}
+        with self.lock:
+            while frontier:
+                frontier = set().union(*(self.reverse.get(p, ()) for p in frontier)) - result
+                result |= frontier
+        return result
+
+    def affected_pages(self, paths):
+        """The HTML pages that show any of the given files (including the files themselves)."""
+        pages = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            pages |= {p for p in self.dependents(path) | {path} if p.lower().endswith((".html", ".htm"))}
+        return pages
+
+# --- Find in Files ---
+SEARCH_EXTENSIONS = {".html", ".htm", ".css", ".js", ".mjs", ".json", ".svg", ".xml", ".txt", ".md"}
+SEARCH_ROOTS = ("src", "assets")
+SEARCH_CACHE = "search-index.json"
+SearchMatch = namedtuple("SearchMatch", "path line column text")
+
+def trigrams(text):
+    """The 3-character runs of text as tuples, line by line; repeated lines are only split once."""
+    result = set()
+    for line in set(text.split("\n")): result.update(zip(line, line[1:], line[2:]))
+    return result
+
+class SearchIndex:
+    """In-memory trigram index over the text files of a project's src/ and assets/ folders.
+
+    Each lower-cased trigram maps to the ids of the files containing it, so a query only
+    scans the files holding all of its trigrams. Texts are kept with a lower-cased copy so
+    matching is plain str.find/str.count. build() walks the project (call it on a
+    worker thread); apply_events() keeps the index current from ProjectWatcher events.
+
+    build() keeps the trigrams in .bws/search-index.json. Files whose size and mtime match
+    it are only read, not split into trigrams again, so reopening a project starts warm;
+    changes made after a build are picked up by the next one.
+    """
+    VERSION = 1
+
+    def __init__(self, project_path, ignore=DEFAULT_IGNORE_GLOBS, roots=SEARCH_ROOTS):
+        self.project_path = os.path.abspath(project_path)
+        self.roots = [os.path.join(self.project_path, root) for root in roots]
+        self.ignore = list(ignore)
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._ids = {}      # path -> file id
+        self._texts = {}    # file id -> (path, text, lower-cased text)
+        self._postings = defaultdict(set) # trigram -> file ids
+        self._stats = {}    # file id -> [size, mtime_ns] when it was read
+        self._next_id = 0
+        self.cache_path = os.path.join(self.project_path, CACHE_DIR, SEARCH_CACHE)
+
+    def build(self):
+        cache = self.load_cache()
+        with self._lock:
+            if self._ids: cache = {} # Already filled by apply_events(); cached file ids could clash
+            cached = cache.get("files", {})
+            self._next_id = max([entry[2] for entry in cached.values()] + [self._next_id - 1]) + 1
+        reused, stale = {}, []
+        for root in self.roots:
+            for directory, dirs, files in os.walk(root):
+                dirs[:] = [d for d in dirs if not is_ignored(d, self.ignore)]
+                for name in files:
+                    path = os.path.join(directory, name)
+                    if is_ignored(name, self.ignore) or not self.covers(path): continue
+                    entry = cached.get(os.path.relpath(path, self.project_path))
+                    try:
+                        st = os.stat(path)
+                        if entry and entry[:2] == [st.st_size, st.st_mtime_ns]: reused[path] = (entry[2], read_text_file(path))
+                        else: stale.append(path)
+                    except (OSError, UnicodeDecodeError):
+                        continue
+        dropped = {entry[2] for entry in cached.values()} - {file_id for file_id, _ in reused.values()}
+        with self._lock:
+            for path, (file_id, text) in reused.items():
+                if path in self._ids: continue
+                self._ids[path] = file_id
+                self._texts[file_id] = (path, text, text.lower())
+                self._stats[file_id] = cached[os.path.relpath(path, self.project_path)][:2]
+            for trigram, file_ids in cache.get("postings", {}).items():
+                self._postings[tuple(trigram)].update(file_ids if not dropped else [i for i in file_ids if i not in dropped])
+        for path in stale: self.update(path)
+        self.ready.set()
+        if dropped or any(path in self._ids for path in stale): self.save_cache()
+
+    def load_cache(self):
+        """The stored {"files": {relative path: [size, mtime_ns, file id]}, "postings": {trigram: [file ids]}}, or {}."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f: data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.VERSION or data.get("ignore") != self.ignore: return {}
+        return data if data.get("roots") == [os.path.relpath(root, self.project_path) for root in self.roots] else {}
+
+    def save_cache(self):
+        with self._lock:
+            files = {os.path.relpath(path, self.project_path): self._stats[file_id] + [file_id] for path, file_id in self._ids.items()}
+            postings = {"".join(trigram): sorted(file_ids) for trigram, file_ids in self._postings.items()}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = self.cache_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"version": self.VERSION, "ignore": self.ignore, "files": files, "postings": postings,
+                                    "roots": [os.path.relpath(root, self.project_path) for root in self.roots]}))
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            pass # Read-only project; the next build indexes everything again
+
+    def covers(self, path):
+        return os.path.splitext(path)[1].lower() in SEARCH_EXTENSIONS and any(path.startswith(root + os.sep) for root in self.roots)
+
+    def update(self, path):
+        """(Re)indexes one file; files that are not text, too large or unreadable are dropped."""
+        text = None
+        if self.covers(path):
+            try:
+                st = os.stat(path)
+                if st.st_size < LARGE_FILE_SIZE: text = read_text_file(path)
+            except (OSError, UnicodeDecodeError):
+                pass
+        with self._lock:
+            self._remove(path)
+            if text is None: return
+            file_id = self._next_id; self._next_id += 1
+            self._ids[path] = file_id
+            folded = text.lower()
+            self._texts[file_id] = (path, text, folded)
+            self._stats[file_id] = [st.st_size, st.st_mtime_ns]
+            for trigram in trigrams(folded): self._postings[trigram].add(file_id)
+
+    def remove(self, path):
+        """Drops a file, or every file below a folder."""
+        with self._lock:
+            prefix = path + os.sep
+            for indexed in [p for p in self._ids if p == path or p.startswith(prefix)]: self._remove(indexed)
+
+    def _remove(self, path):
+        file_id = self._ids.pop(path, None)
+        if file_id is None: return
+        _, _, folded = self._texts.pop(file_id)
+        self._stats.pop(file_id, None)
+        for trigram in trigrams(folded):
+            postings = self._postings[trigram]
+            postings.discard(file_id)
+            if not postings: del self._postings[trigram]
+
+    def apply_events(self, events):
+        for event in events:
+            if event.kind in ("deleted", "renamed"): self.remove(event.path)
+            path = event.new_path or event.path
+            if event.kind == "deleted" or is_ignored(os.path.basename(path), self.ignore): continue
+            if not event.is_dir:
+                self.update(path); continue
+            for directory, dirs, files in os.walk(path):
+                dirs[:] = [d for d in dirs if not is_ignored(d, self.ignore)]
+                for name in files:
+                    if not is_ignored(name, self.ignore): self.update(os.path.join(directory, name))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def candidates(self, query):
+        """Returns [(path, text, folded)] of the files that may contain query (all files for short queries)."""
+        with self._lock:
+            if len(query) < 3: return list(self._texts.values())
+            file_ids = None
+            for trigram in sorted(trigrams(query.lower()), key=lambda t: len(self._postings.get(t, ()))):
+                postings = self._postings.get(trigram)
+                if not postings: return []
+                file_ids = set(postings) if file_ids is None else file_ids & postings
+            return [self._texts[file_id] for file_id in file_ids]
+
+    def search(self, query, case_sensitive=False, limit=5000):
+        """Yields (path, [SearchMatch]) per matching file, best files first: name hits, then most matches."""
+        if not query: return
+        needle = query if case_sensitive else query.lower()
+        ranked = []
+        for path, text, folded in self.candidates(query):
+            # lower() can change the length of some characters; then positions come from the original text
+            haystack = text if case_sensitive or len(folded) != len(text) else folded
+            count = haystack.count(needle) if haystack is not text or case_sensitive else len(re.findall(re.escape(query), text, re.IGNORECASE))
+            if count: ranked.append((needle not in os.path.basename(path).lower(), -count, path, text, haystack))
+        ranked.sort(key=lambda r: r[:3])
+        for _, _, path, text, haystack in ranked:
+            if limit <= 0: return
+            if haystack is text and not case_sensitive:
+                positions = [m.start() for m in re.finditer(re.escape(query), text, re.IGNORECASE)][:limit]
+            else:
+                positions, position = [], haystack.find(needle)
+                while position >= 0 and len(positions) < limit:
+                    positions.append(position); position = haystack.find(needle, position + len(needle))
+            matches, line, line_start = [], 1, 0
+            for position in positions:
+                line += text.count("\n", line_start, position)
+                line_start = text.rfind("\n", 0, position) + 1
+                line_end = text.find("\n", position)
+                matches.append(SearchMatch(path, line, position - line_start, text[line_start:line_end if line_end >= 0 else len(text)].strip()[:200]))
+            limit -= len(matches)
+            yield path, matches
+
+    def replace(self, query, replacement, case_sensitive=False, skip=()):
+        """Replaces query in every matching file on disk except those in skip; returns {path: count}."""
+        pattern = re.compile(re.escape(query), 0 if case_sensitive else re.IGNORECASE)
+        counts = {}
+        for path, _, _ in self.candidates(query):
+            if path in skip: continue
+            try:
+                with open(path, "r", encoding="utf-8", newline="") as f: text = f.read()
+                text, count = pattern.subn(lambda m: replacement, text)
+                if not count: continue
+                write_text_file(path, text, newline="") # Read with newline="", so line ends are already the file's
+            except (OSError, UnicodeDecodeError):
+                continue
+            counts[path] = count
+            self.update(path)
+        return counts
+
+# --- Live Reload Dev Server ---
+# Injected into every HTML page; stylesheets are swapped in place, anything else reloads the page.
+LIVE_RELOAD_CLIENT = """<script>
+(function () {
+  var source = new EventSource("/__bws__/events");
+  source.addEventListener("css", function (event) {
+    var path = JSON.parse(event.data).path, swapped = false;
+    document.querySelectorAll('link[rel="stylesheet"]').forEach(function (link) {
+      var url = new URL(link.href, location.href);
+      if (url.pathname !== path) return;
+      url.searchParams.set("bws", Date.now());
+      var fresh = link.cloneNode();
+      fresh.onload = function () { link.remove(); };
+      fresh.href = url.href;
+      link.after(fresh);
+      swapped = true;
+    });
+    if (!swapped) location.reload();
+  });
+  source.addEventListener("reload", function (event) {
+    var pages = JSON.parse(event.data).pages, path = location.pathname;
+    if (path.slice(-1) === "/") path += "index.html";
+    if (!pages || pages.indexOf(path) >= 0) location.reload();
+  });
+})();
+</script>
+"""
+
+class DevServer:
+    """Serves a folder over HTTP and pushes change notifications to open pages via Server-Sent Events.
+
+    Files are kept in memory keyed by (mtime, size) and answered with an ETag, so unchanged
+    files cost one stat and a 304. Change events (from a ProjectWatcher) are collected for
+    debounce seconds: if only stylesheets changed they are hot-swapped, otherwise the
+    pages that the DependencyGraph links to the changed files get a single reload.
+    """
+    MAX_CACHED_FILE = 2 * 1024 * 1024
+    EVENTS_PATH = "/__bws__/events"
+
+    def __init__(self, root, host="127.0.0.1", port=0, watcher=None, debounce=0.1):
+        self.root = os.path.abspath(root)
+        self.debounce = debounce
+        self.cache = {}     # file path -> (mtime_ns, size, etag, content type, body)
+        self.clients = set()
+        self.lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+        self._owns_watcher = watcher is None
+        self.watcher = watcher or ProjectWatcher(self.root, interval=0.25)
+        self.watcher.subscribe(self.notify)
+        self.graph = DependencyGraph(self.root)
+        from http.server import ThreadingHTTPServer
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        if self._owns_watcher: self.watcher.start()
+        threading.Thread(target=self.graph.scan, name="DependencyGraph", daemon=True).start()
+        threading.Thread(target=self.httpd.serve_forever, name="DevServer", daemon=True).start()
+        return self.url
+
+    def stop(self):
+        if self._owns_watcher: self.watcher.stop()
+        with self.lock:
+            for client in self.clients: client.put(None)
+            if self._timer: self._timer.cancel()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def has_clients(self):
+        with self.lock: return bool(self.clients)
+
+    def broadcast(self, event, data=None):
+        message = f"event: {event}\ndata: {json.dumps(data or {})}\n\n".encode("utf-8")
+        with self.lock:
+            for client in self.clients: client.put(message)
+
+    def notify(self, events):
+        """Watcher callback; collects events under the served folder until the debounce timer fires."""
+        events = [e for e in events if (e.new_path or e.path).startswith(self.root + os.sep)]
+        if not events: return
+        with self.lock:
+            self._pending.extend(events)
+            if self._timer: self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self):
+        with self.lock:
+            events, self._pending, self._timer = self._pending, [], None
+        changed = set()
+        for event in events:
+            self.cache.pop(event.path, None)
+            if event.kind == "deleted" or event.kind == "renamed": self.graph.remove(event.path)
+            else: self.graph.update(event.path)
+            if event.new_path: self.graph.update(event.new_path)
+            changed.update(p for p in (event.path, event.new_path) if p)
+        if all(e.kind in ("created", "modified") and e.path.endswith(".css") for e in events):
+            for path in sorted(changed):
+                self.broadcast("css", {"path": self.url_path(path)})
+        elif any(e.is_dir for e in events):
+            self.broadcast("reload") # Folder events do not name the files inside; reload every page
+        else:
+            pages = self.graph.affected_pages(changed)
+            if pages: self.broadcast("reload", {"pages": sorted(self.url_path(p) for p in pages)})
+
+    def url_path(self, path):
+        return "/" + Path(os.path.relpath(path, self.root)).as_posix()
+
+    def load(self, path):
+        """Returns (etag, content type, body) for a file, from the cache while its mtime is unchanged."""
+        st = os.stat(path)
+        cached = self.cache.get(path)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2:]
+        with open(path, "rb") as f: body = f.read()
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type == "text/html":
+            body = inject_live_reload(body)
+        entry = (st.st_mtime_ns, st.st_size, f'"{st.st_mtime_ns:x}-{st.st_size:x}"', content_type, body)
+        if st.st_size <= self.MAX_CACHED_FILE: self.cache[path] = entry
+        return entry[2:]
+
+    def resolve(self, url_path):
+        """Maps a request path to a file below the root, or None if there is no such file."""
+        relative = posixpath.normpath(unquote(urlsplit(url_path).path)).lstrip("/")
+        path = os.path.join(self.root, *[part for part in relative.split("/") if part not in ("", ".", "..")])
+        if os.path.isdir(path): path = os.path.join(path, "index.html")
+        return path if os.path.isfile(path) else None
+
+    def _make_handler(self):
+        from http.server import BaseHTTPRequestHandler
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == server.EVENTS_PATH: return self.stream_events()
+                self.send_file(head_only=False)
+
+            def do_HEAD(self):
+                self.send_file(head_only=True)
+
+            def send_file(self, head_only):
+                path = server.resolve(self.path)
+                if path is None:
+                    return self.send_error(404, "File not found")
+                try:
+                    etag, content_type, body = server.load(path)
+                except OSError:
+                    return self.send_error(404, "File not found")
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304); self.send_header("ETag", etag); self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                if not head_only: self.wfile.write(body)
+
+            def stream_events(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                messages = queue.Queue()
+                with server.lock: server.clients.add(messages)
+                try:
+                    while True:
+                        try:
+                            message = messages.get(timeout=15)
+                        except queue.Empty:
+                            message = b": keep-alive\n\n"
+                        if message is None: break
+                        self.wfile.write(message); self.wfile.flush()
+                except OSError:
+                    pass # The page went away
+                finally:
+                    with server.lock: server.clients.discard(messages)
+
+            def log_message(self, format, *args):
+                pass # Keep the request log out of the editor's stdout
+
+        return Handler
+
+def inject_live_reload(body):
+    """Inserts the live reload client before the last </body>, or appends it."""
+    index = body.lower().rfind(b"</body>")
+    client = LIVE_RELOAD_CLIENT.encode("utf-8")
+    return body + client if index < 0 else body[:index] + client + body[index:]
+
+# --- Incremental Build ---
+# Inputs (relative to the project) and where they land inside the output folder; override with "build" in project.bws
+DEFAULT_BUILD_INPUTS = {"src": "", "assets": "assets"}
+BUILD_MANIFEST = "build-manifest.json"
+BUILD_POOL_THRESHOLD = 16  # Fewer changed files than this are processed in-process
+
+BuildReport = namedtuple("BuildReport", "built unchanged removed errors seconds cancelled", defaults=(False,))
+
+def hash_bytes(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+# Quoted strings and url(...) are kept byte for byte; comments are only recognised outside them
+CSS_LITERAL_PATTERN = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\(\s*(?:"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|[^)"']*)\s*\))|/\*.*?\*/""",
+                                 re.DOTALL | re.IGNORECASE)
+
+def minify_css(text):
+    text = CSS_LITERAL_PATTERN.sub(lambda match: match.group(1) or " ", text)
+    pieces = CSS_LITERAL_PATTERN.split(text) # Code and literals alternate; comments are gone, so no None pieces
+    for i in range(0, len(pieces), 2):
+        pieces[i] = re.sub(r"\s*([{};,>])\s*", r"\1", re.sub(r"\s+", " ", pieces[i]))
+    return "".join(pieces).strip()
+
+# Raw-text elements and tags (with their quoted attribute values) are kept whole; only comments between them go
+HTML_COMMENT_PATTERN = re.compile(r"""(<(script|style|textarea|title)\b(?:"[^"]*"|'[^']*'|[^'">])*>.*?</\2\s*>"""
+                                  r"""|<[a-zA-Z/](?:"[^"]*"|'[^']*'|[^'">])*>)|<!--(?!\[if).*?-->""", re.DOTALL | re.IGNORECASE)
+
+def minify_html(text):
+    # Conditional comments (<!--[if ...]>) are kept
+    return HTML_COMMENT_PATTERN.sub(lambda match: match.group(1) or "", text)
+
+MINIFIERS = {".css": minify_css, ".html": minify_html, ".htm": minify_html}
+
+def build_file(source, target, old_hash, minify):
+    """Builds one output file; returns (content hash, whether it was written).
+
+    Runs in worker processes, so it only deals in paths and plain values.
+    """
+    with open(source, "rb") as f: data = f.read()
+    content_hash = hash_bytes(data)
+    if content_hash == old_hash and os.path.exists(target):
+        return content_hash, False
+    minifier = MINIFIERS.get(os.path.splitext(source)[1].lower()) if minify else None
+    if minifier:
+        data = minifier(data.decode("utf-8")).encode("utf-8")
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as f: f.write(data)
+    return content_hash, True
+
+class ProjectBuilder:
+    """Builds src/ and assets/ into dist/ and only reprocesses what changed.
+
+    A manifest in .bws/ remembers, per input, its stat signature and content hash.
+    Inputs whose size and mtime are unchanged are skipped without being read; the rest
+    are hashed and written only when the content differs. Every output depends on its own
+    input alone (files are copied or minified, references are left as they are), so a
+    changed stylesheet does not make the pages that link it stale. Larger batches run in a
+    ProcessPoolExecutor.
+    """
+    def __init__(self, project_path, config=None, jobs=None, log=None):
+        self.project_path = os.path.abspath(project_path)
+        self.config = load_project_config(project_path) if config is None else config
+        build = self.config.get("build", {})
+        self.inputs = build.get("inputs", DEFAULT_BUILD_INPUTS)
+        self.output = os.path.join(self.project_path, build.get("output", "dist"))
+        self.minify = bool(build.get("minify", False))
+        package = self.config.get("package")
+        package_output = package.get("output", "release") if isinstance(package, dict) else "release"
+        # Skipped by path, not by name: src/vendor/lib/dist is an input like any other
+        self.skipped = {os.path.normpath(os.path.join(self.project_path, folder))
+                        for folder in (build.get("output", "dist"), package_output, CACHE_DIR) if isinstance(folder, str)}
+        self.jobs = jobs
+        self.log = log or (lambda message: None)
+        self.manifest_path = os.path.join(self.project_path, CACHE_DIR, BUILD_MANIFEST)
+
+    def options(self):
+        """Settings that change every output; the manifest is discarded when they differ."""
+        return {"inputs": self.inputs, "output": self.output, "minify": self.minify}
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f: manifest = json.load(f)
+            if manifest.get("options") == self.options(): return manifest.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {}
+
+    def save_manifest(self, files):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f: f.write(json.dumps({"options": self.options(), "files": files}))
+        os.replace(temp_path, self.manifest_path)
+
+    def collect_inputs(self):
+        """Returns {relative input path: (absolute source, absolute target, os.stat_result, input root)}."""
+        found, skipped = {}, self.skipped
+        for input_dir, output_dir in self.inputs.items():
+            # Walk with posix-style relative prefixes; this runs for every file on every build
+            root = os.path.normpath(os.path.join(self.project_path, input_dir))
+            stack = [(root, "")]
+            while stack:
+                directory, relative = stack.pop()
+                try:
+                    with os.scandir(directory) as it: entries = list(it)
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.is_dir():
+                        if entry.path not in skipped: stack.append((entry.path, relative + entry.name + "/"))
+                    elif entry.is_file():
+                        target = os.path.join(self.output, output_dir, relative + entry.name)
+                        found[f"{input_dir}/{relative}{entry.name}"] = (entry.path, target, entry.stat(), root)
+        return found
+
+    def build(self, cancel=None):
+        """Runs one incremental build; setting the cancel Event stops it between files."""
+        started = time.perf_counter()
+        # Raises ValueError for an output such as "", ".." or "src" before anything is written
+        checked_output_folder(self.project_path, self.config.get("build", {}).get("output", "dist"), self.inputs)
+        manifest = self.load_manifest()
+        inputs = self.collect_inputs()
+
+        stale = {name for name, (source, target, st, root) in inputs.items()
+                 if manifest.get(name, {}).get("stat") != [st.st_mtime_ns, st.st_size] or not os.path.exists(target)}
+        removed = set(manifest) - set(inputs)
+
+        files, errors, built = {}, [], 0
+        for name in set(inputs) - stale:
+            files[name] = manifest[name]
+        for name in removed:
+            try: os.remove(manifest[name]["output"])
+            except OSError: pass
+
+        jobs = {name: (source, target, manifest.get(name, {}).get("hash"), self.minify)
+                for name, (source, target, st, root) in inputs.items() if name in stale}
+        cancelled = False
+        for name, outcome in self._run_jobs(jobs):
+            if cancel is not None and cancel.is_set():
+                # Inputs not recorded in the manifest are simply stale again next time
+                cancelled = True; break
+            source, target, st, root = inputs[name]
+            if isinstance(outcome, Exception):
+                errors.append(f"{name}: {outcome}"); continue
+            content_hash, written = outcome
+            built += written
+            files[name] = {"stat": [st.st_mtime_ns, st.st_size], "hash": content_hash, "output": target}
+
+        if stale or removed: self.save_manifest(files)
+        if cancelled:
+            report = BuildReport(built, len(files) - built, len(removed), errors, time.perf_counter() - started, True)
+            self.log(f"Build cancelled after {report.built} file(s).")
+            return report
+        report = BuildReport(built, len(inputs) - built - len(errors), len(removed), errors, time.perf_counter() - started)
+        for error in errors: self.log(f"Error: {error}")
+        self.log(f"Built {report.built} file(s), {report.unchanged} unchanged, {report.removed} removed "
+                 f"in {report.seconds * 1000:.0f} ms.")
+        return report
+
+    def _run_jobs(self, jobs):
+        if len(jobs) < BUILD_POOL_THRESHOLD or self.jobs == 1:
+            for name, args in jobs.items():
+                try: yield name, build_file(*args)
+                except Exception as e: yield name, e
+            return
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        pool = ProcessPoolExecutor(max_workers=self.jobs)
+        try:
+            futures = {pool.submit(build_file, *args): name for name, args in jobs.items()}
+            for future in as_completed(futures):
+                try: yield futures[future], future.result()
+                except Exception as e: yield futures[future], e
+        finally:
+            pool.shutdown(cancel_futures=True) # A cancelled build does not wait for queued files
+
+def checked_output_folder(project_path, folder, inputs, others=()):
+    """Resolves an output folder from project.bws; raises ValueError unless it is strictly inside the project
+    and neither is, contains nor lies inside an input folder, .bws or one of the other (absolute) folders.
+
+    Output folders get deleted and rewritten, so "", "..", "src" or an absolute path must never pass.
+    """
+    if not isinstance(folder, str) or not folder.strip():
+        raise ValueError(f"Output folder {folder!r} must name a subfolder of the project.")
+    project = os.path.realpath(project_path)
+    path = os.path.realpath(os.path.join(project, folder))
+    if not path.startswith(project + os.sep):
+        raise ValueError(f"Output folder {folder!r} must be a subfolder of the project.")
+    for other in [os.path.join(project, name) for name in inputs] + [os.path.join(project, CACHE_DIR)] + list(others):
+        other = os.path.realpath(other)
+        if path == other or path.startswith(other + os.sep) or other.startswith(path + os.sep):
+            raise ValueError(f"Output folder {folder!r} overlaps {os.path.relpath(other, project)}.")
+    return path
+
+def package_scripts(project_path):
+    """The "scripts" of the project's package.json ({} without one)."""
+    try:
+        with open(Path(project_path) / "package.json", "r", encoding="utf-8") as f: scripts = json.load(f).get("scripts", {})
+        return scripts if isinstance(scripts, dict) else {}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def wants_npm_build(project_path, config):
+    """npm is an optional extra step: on if "build": {"npm": true}, or unset and package.json has a build script."""
+    npm = config.get("build", {}).get("npm")
+    if npm is not None: return bool(npm)
+    return "build" in package_scripts(project_path)
+
+def npm_watch_script(project_path, config):
+    """The npm script to keep running instead of `npm run build`: "build": {"watch": name}, or a "watch" script; false disables."""
+    watch = config.get("build", {}).get("watch")
+    if watch is False: return None
+    if isinstance(watch, str): return watch
+    return "watch" if "watch" in package_scripts(project_path) else None
+
+# --- Production Packaging ---
+PACKAGE_MANIFEST = "asset-manifest.json"
+FINGERPRINT_EXTENSIONS = {".css", ".js", ".mjs", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".avif", ".ico",
+                          ".woff", ".woff2", ".ttf", ".otf"}
+GZIP_EXTENSIONS = {".html", ".htm", ".css", ".js", ".mjs", ".svg", ".json", ".xml", ".txt", ".map", ".ico", ".ttf", ".otf"}
+# Attribute names are anchored with (?<![-\w]), so data-src= and data-href= (lazy loading) are left alone
+HTML_ATTRIBUTE_PATTERN = re.compile(r"""((?<![-\w])(?:href|src|poster)\s*=\s*)(["'])(.*?)\2""", re.IGNORECASE)
+HTML_SRCSET_PATTERN = re.compile(r"""((?<![-\w])srcset\s*=\s*)(["'])(.*?)\2""", re.IGNORECASE)
+HTML_STYLE_ATTRIBUTE_PATTERN = re.compile(r"""((?<![-\w])style\s*=\s*)(["'])(.*?)\2""", re.IGNORECASE | re.DOTALL)
+HTML_STYLE_PATTERN = re.compile(r"(<style\b[^>]*>)(.*?)(</style\s*>)", re.IGNORECASE | re.DOTALL)
+HTML_STYLESHEET_PATTERN = re.compile(r"""<link\b(?=[^>]*(?<![-\w])rel\s*=\s*["']?stylesheet\b)[^>]*?(?<![-\w])href\s*=\s*(["'])(.*?)\1[^>]*>""", re.IGNORECASE)
+HTML_MEDIA_PATTERN = re.compile(r"""(?<![-\w])media\s*=\s*(?:(["'])(.*?)\1|([^\s"'>]+))""", re.IGNORECASE)
+HTML_DEFERRED_PATTERN = re.compile(r"(?<![-\w])(?:defer|async)(?![-\w])", re.IGNORECASE)
+HTML_SCRIPT_PATTERN = re.compile(r"""<script\b([^>]*?)\s*(?<![-\w])src\s*=\s*(["'])(.*?)\2([^>]*)>\s*</script\s*>""", re.IGNORECASE)
+
+PackageReport = namedtuple("PackageReport", "files fingerprinted inlined input_bytes output_bytes gzip_bytes seconds")
+
+def gzip_file(path):
+    """Writes path + ".gz" at maximum compression; returns its size, or None when it would not be smaller.
+
+    Runs in worker processes. mtime=0 keeps the output identical for identical input.
+    """
+    import gzip
+    with open(path, "rb") as f: data = f.read()
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) >= len(data): return None
+    with open(path + ".gz", "wb") as f: f.write(compressed)
+    return len(compressed)
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB": return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+class ProductionPackager:
+    """Turns the build output (dist/) into a production copy in "package": {"output": "release"}.
+
+    Stylesheets, scripts, images and fonts that a page or stylesheet references are renamed to
+    name.<content hash>.ext and the references rewritten, so hosts can cache them forever.
+    Stylesheets and scripts up to "inline_max" bytes are inlined into the pages that link
+    them (0, the default, disables inlining). Text files get a .gz variant at level 9, compressed
+    in a ProcessPoolExecutor. Scripts imported by other scripts keep their names, since
+    import specifiers are not rewritten. Renamed files are also kept under their original
+    names, so URLs that scripts put together at runtime still resolve.
+    """
+    def __init__(self, project_path, config=None, jobs=None, log=None):
+        self.project_path = os.path.abspath(project_path)
+        self.config = load_project_config(project_path) if config is None else config
+        package = self.config.get("package", {})
+        package = package if isinstance(package, dict) else {}
+        builder = ProjectBuilder(self.project_path, self.config)
+        self.source = builder.output
+        self.output = checked_output_folder(self.project_path, package.get("output", "release"), builder.inputs, [builder.output])
+        self.fingerprint = bool(package.get("fingerprint", True))
+        self.inline_max = int(package.get("inline_max", 0))
+        self.gzip = bool(package.get("gzip", True))
+        self.jobs = jobs
+        self.log = log or (lambda message: None)
+
+    def package(self):
+        """Rebuilds the output folder from scratch; returns a PackageReport."""
+        import shutil
+        started = time.perf_counter()
+        # Only a folder an earlier run wrote (it has the manifest) is deleted; anything else is the user's
+        if os.path.isdir(self.output) and os.listdir(self.output) and not os.path.isfile(os.path.join(self.output, PACKAGE_MANIFEST)):
+            raise ValueError(f"{self.output} is not empty and has no {PACKAGE_MANIFEST} from an earlier package run; "
+                             f"remove it or choose another \"package\": {{\"output\"}}.")
+        contents = {}
+        for directory, dirs, names in os.walk(self.source):
+            for name in names:
+                if name.endswith(".gz"): continue
+                path = os.path.join(directory, name)
+                with open(path, "rb") as f: contents[path] = f.read()
+
+        self.renamed = {} # Source path -> fingerprinted path, filled in by _fingerprint
+        if self.fingerprint: self._fingerprint(contents)
+        outputs, inlined = {}, 0
+        for path, data in contents.items():
+            extension = os.path.splitext(path)[1].lower()
+            if extension == ".css":
+                data = self._rewrite_css(data.decode("utf-8", errors="replace"), path).encode("utf-8")
+            outputs[self.renamed.get(path, path)] = outputs[path] = data
+        for path in contents:
+            if os.path.splitext(path)[1].lower() in (".html", ".htm"):
+                text, count = self._rewrite_html(contents[path].decode("utf-8", errors="replace"), path, outputs)
+                outputs[path] = text.encode("utf-8"); inlined += count
+
+        if os.path.isdir(self.output): shutil.rmtree(self.output)
+        os.makedirs(self.output, exist_ok=True) # An empty or missing build output still gets a manifest
+        targets = []
+        for path, data in outputs.items():
+            target = os.path.join(self.output, os.path.relpath(path, self.source))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f: f.write(data)
+            targets.append(target)
+        manifest = {self._relative(path): self._relative(renamed) for path, renamed in sorted(self.renamed.items())}
+        with open(os.path.join(self.output, PACKAGE_MANIFEST), "w", encoding="utf-8") as f: json.dump(manifest, f, indent=1)
+
+        sizes = {target: len(data) for target, data in zip(targets, outputs.values())}
+        compressed = dict(self._compress([t for t in targets if os.path.splitext(t)[1].lower() in GZIP_EXTENSIONS])) if self.gzip else {}
+        report = PackageReport(len(outputs), len(self.renamed), inlined, sum(map(len, contents.values())), sum(sizes.values()),
+                               sum(compressed.get(target) or size for target, size in sizes.items()), time.perf_counter() - started)
+        saved = 100 - 100 * report.gzip_bytes / report.input_bytes if report.input_bytes else 0
+        self.log(f"Packaged {report.files} file(s) into {os.path.relpath(self.output, self.project_path)} in "
+                 f"{report.seconds * 1000:.0f} ms: {report.fingerprinted} fingerprinted, {report.inlined} inlined; "
+                 f"{format_bytes(report.input_bytes)} -> {format_bytes(report.output_bytes)}, "
+                 f"{format_bytes(report.gzip_bytes)} gzipped ({saved:.0f}% smaller).")
+        return report
+
+    def _relative(self, path):
+        return os.path.relpath(path, self.source).replace(os.sep, "/")
+
+    def _fingerprint(self, contents):
+        """Records a fingerprinted name for every referenced asset in self.renamed."""
+        referenced, imported = set(), set()
+        for path, data in contents.items():
+            extension = os.path.splitext(path)[1].lower()
+            if extension in (".html", ".htm", ".css"):
+                referenced |= extract_references(path, data.decode("utf-8", errors="replace"), self.source)
+            elif extension in (".js", ".mjs"):
+                imported |= extract_references(path, data.decode("utf-8", errors="replace"), self.source)
+        candidates = {path for path in referenced - imported
+                      if path in contents and os.path.splitext(path)[1].lower() in FINGERPRINT_EXTENSIONS}
+        renamed = self.renamed
+        def visit(path, visiting):
+            # Stylesheets are hashed after their own references were rewritten, so a changed image renames them too
+            if path in renamed or path in visiting: return
+            data = contents[path]
+            if path.endswith(".css"):
+                visiting.add(path)
+                text = data.decode("utf-8", errors="replace")
+                for dependency in extract_references(path, text, self.source) & candidates: visit(dependency, visiting)
+                data = self._rewrite_css(text, path).encode("utf-8")
+            stem, extension = os.path.splitext(path)
+            renamed[path] = f"{stem}.{hash_bytes(data)[:10]}{extension}"
+        for path in sorted(candidates): visit(path, set())
+
+    def _rewrite_url(self, url, from_file, base_dir=None):
+        """url with its target replaced by the fingerprinted name; relative to base_dir when the text moves there."""
+        target = resolve_reference(url, from_file, self.source)
+        if target is None: return url
+        final = self.renamed.get(target, target)
+        if final == target and base_dir is None: return url
+        stripped = url.strip()
+        suffix = stripped[len(stripped.split("#")[0].split("?")[0]):]
+        if stripped.startswith("/"):
+            return "/" + self._relative(final) + suffix
+        return os.path.relpath(final, base_dir or os.path.dirname(from_file)).replace(os.sep, "/") + suffix
+
+    def _rewrite_css(self, text, path, base_dir=None):
+        def replace(match):
+            group = 1 if match.group(1) else 2
+            whole, offset = match.group(0), match.start()
+            return (whole[:match.start(group) - offset] + self._rewrite_url(match.group(group), path, base_dir)
+                    + whole[match.end(group) - offset:])
+        return CSS_URL_PATTERN.sub(replace, text)
+
+    def _rewrite_html(self, text, path, outputs):
+        """Returns the page with fingerprinted references and small assets inlined, and the inline count."""
+        rewrite = lambda url: self._rewrite_url(url, path)
+        text = HTML_ATTRIBUTE_PATTERN.sub(lambda m: m.group(1) + m.group(2) + rewrite(m.group(3)) + m.group(2), text)
+        text = HTML_SRCSET_PATTERN.sub(lambda m: m.group(1) + m.group(2) + ", ".join(
+            " ".join([rewrite(candidate.split()[0])] + candidate.split()[1:])
+            for candidate in m.group(3).split(",") if candidate.strip()) + m.group(2), text)
+        text = HTML_STYLE_PATTERN.sub(lambda m: m.group(1) + self._rewrite_css(m.group(2), path) + m.group(3), text)
+        text = HTML_STYLE_ATTRIBUTE_PATTERN.sub(lambda m: m.group(1) + m.group(2) + self._rewrite_css(m.group(3), path) + m.group(2), text)
+        if not self.inline_max: return text, 0
+
+        inlined = 0
+        def small_asset(url, closing):
+            target = resolve_reference(url, path, self.source)
+            data = outputs.get(target)
+            if data is None or len(data) > self.inline_max: return None
+            content = data.decode("utf-8", errors="replace")
+            return None if closing in content.lower() else (target, content)
+        def inline_style(match):
+            nonlocal inlined
+            asset = small_asset(match.group(2), "</style")
+            if asset is None: return match.group(0)
+            inlined += 1
+            # A media query ("print", "(min-width: ...)") must keep applying to the inlined rules
+            media = HTML_MEDIA_PATTERN.search(match.group(0))
+            media = (media.group(2) if media.group(1) else media.group(3)).strip() if media else ""
+            attributes = f' media="{media.replace(chr(34), "&quot;")}"' if media and media.lower() != "all" else ""
+            return f"<style{attributes}>{self._rewrite_css(asset[1], asset[0], os.path.dirname(path))}</style>"
+        def inline_script(match):
+            nonlocal inlined
+            asset = small_asset(match.group(3), "</script")
+            # defer and async do nothing on inline scripts, so those would run before the page is parsed;
+            # relative imports would resolve against the page instead of the script
+            if HTML_DEFERRED_PATTERN.search(match.group(1) + match.group(4)): return match.group(0)
+            if asset is None or any(url.startswith(".") for url in JS_IMPORT_PATTERN.findall(asset[1])): return match.group(0)
+            inlined += 1
+            return f"<script{match.group(1)}{match.group(4)}>{asset[1]}</script>"
+        text = HTML_STYLESHEET_PATTERN.sub(inline_style, text)
+        text = HTML_SCRIPT_PATTERN.sub(inline_script, text)
+        return text, inlined
+
+    def _compress(self, paths):
+        """Yields (path, compressed size or None), using worker processes for larger batches."""
+        if len(paths) < BUILD_POOL_THRESHOLD or self.jobs == 1:
+            for path in paths: yield path, gzip_file(path)
+            return
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            yield from zip(paths, pool.map(gzip_file, paths, chunksize=8))
+
+def wants_package(config):
+    """Packaging runs after every build when project.bws has a "package" section (true or an object without "enabled": false)."""
+    package = config.get("package")
+    if isinstance(package, dict): return package.get("enabled", True) is not False
+    return bool(package)
+
+# --- Build Scheduler ---
+ScheduledBuild = namedtuple("ScheduledBuild", "number status seconds queued") # status: "finished", "failed" or "cancelled"
+
+class BuildScheduler:
+    """Runs a project's builds one at a time on a long-lived background thread.
+
+    Requests that arrive while a build runs are folded into a single follow-up build.
+    cancel() stops the running build: the native step between files, the npm step by
+    terminating its process. When the project has an npm watch script (npm_watch_script),
+    it is started once and kept running, so later builds only run the native step while
+    the warm watcher rebuilds the bundle by itself. A "package" section in project.bws adds
+    the ProductionPackager as a last step. Without a config, project.bws is read again for
+    every build. log(message) and finished(ScheduledBuild) are called on the
+    scheduler thread.
+    """
+    def __init__(self, project_path, config=None, log=None, finished=None):
+        self.project_path = os.path.abspath(project_path)
+        self.config = config
+        self.log = log or (lambda message: None)
+        self.finished = finished or (lambda build: None)
+        self.builds = 0
+        self._requested = False
+        self._running = False
+        self._stopped = False
+        self._cancel = threading.Event()
+        self._process = None       # Running `npm run build`
+        self._watch_process = None # Warm npm watch script
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="BuildScheduler", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self):
+        with self._condition: return self._running or self._requested
+
+    def request(self):
+        with self._condition:
+            if self._running and not self._requested: self.log("A build is running; queued one more to follow it.")
+            self._requested = True
+            self._condition.notify()
+
+    def cancel(self):
+        """Drops a queued follow-up and stops the running build; returns False if nothing was running."""
+        with self._condition:
+            self._requested = False
+            if not self._running: return False
+            self._cancel.set()
+            process = self._process
+        if process: _terminate(process)
+        return True
+
+    def stop(self):
+        """Cancels any build and ends the thread and the npm watch script."""
+        self.cancel()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+            watch_process = self._watch_process
+        if watch_process and watch_process.poll() is None:
+            _terminate(watch_process)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._requested or self._stopped)
+                if self._stopped: return
+                self._requested, self._running = False, True
+                self._cancel.clear()
+                self.builds += 1; number = self.builds
+            started = time.perf_counter()
+            self.log(f"Build #{number} started.")
+            try:
+                status, phases = self._build()
+            except Exception as e:
+                self.log(f"Error: {e}")
+                status, phases = "failed", []
+            seconds = time.perf_counter() - started
+            with self._condition:
+                self._running = False
+                queued = self._requested
+            timing = ", ".join(f"{name} {phase * 1000:.0f} ms" for name, phase in phases)
+            self.log(f"Build #{number} {status} in {seconds * 1000:.0f} ms" + (f" ({timing})." if timing else "."))
+            self.finished(ScheduledBuild(number, status, seconds, queued))
+
+    def _build(self):
+        phases = []
+        started = time.perf_counter()
+        config = load_project_config(self.project_path) if self.config is None else self.config
+        report = ProjectBuilder(self.project_path, config=config, log=self.log).build(cancel=self._cancel)
+        phases.append(("native", time.perf_counter() - started))
+        if report.cancelled: return "cancelled", phases
+        if report.errors: return "failed", phases
+        if not wants_npm_build(self.project_path, config): return self._package(config, phases)
+
+        watch = npm_watch_script(self.project_path, config)
+        if watch:
+            # Started under the lock, so stop() either sees the process or this sees _stopped
+            with self._condition:
+                if self._cancel.is_set() or self._stopped: return "cancelled", phases
+                if self._watch_process is None or self._watch_process.poll() is not None:
+                    self.log(f"Starting 'npm run {watch}'; it keeps rebuilding in the background.")
+                    self._watch_process = _start_npm(self.project_path, watch)
+                    threading.Thread(target=_pipe_lines, args=(self._watch_process, self.log, f"[{watch}] "), daemon=True).start()
+            return self._package(config, phases)
+
+        started = time.perf_counter()
+        self.log("Running 'npm run build'...")
+        with self._condition:
+            if self._cancel.is_set() or self._stopped: return "cancelled", phases
+            self._process = _start_npm(self.project_path, "build")
+        try:
+            _pipe_lines(self._process, self.log)
+            return_code = self._process.wait()
+        finally:
+            with self._condition: self._process = None
+        phases.append(("npm", time.perf_counter() - started))
+        if self._cancel.is_set(): return "cancelled", phases
+        if return_code != 0:
+            self.log(f"npm exited with code {return_code}.")
+            return "failed", phases
+        return self._package(config, phases)
+
+    def _package(self, config, phases):
+        """Runs the production packaging stage after a successful build, if the project has one."""
+        if wants_package(config) and not self._cancel.is_set():
+            started = time.perf_counter()
+            ProductionPackager(self.project_path, config, log=self.log).package()
+            phases.append(("package", time.perf_counter() - started))
+        return "finished", phases
+
+def _start_npm(project_path, script):
+    """Starts `npm run <script>` with merged output; raises FileNotFoundError without npm."""
+    import subprocess
+    options = {}
+    if sys.platform == "win32":
+        # Hide the console window
+        options["startupinfo"] = subprocess.STARTUPINFO()
+        options["startupinfo"].dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    else:
+        options["start_new_session"] = True # Own process group, so node children are terminated with npm
+    try:
+        return subprocess.Popen(["npm", "run", script], cwd=project_path, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, encoding="utf-8", errors="replace", **options)
+    except FileNotFoundError:
+        raise FileNotFoundError("'npm' command not found. Is Node.js installed and in your PATH?") from None
+
+def _pipe_lines(process, log, prefix=""):
+    for line in iter(process.stdout.readline, ""): log(prefix + line.rstrip())
+    process.stdout.close()
+
+def _terminate(process):
+    try:
+        if sys.platform == "win32": process.terminate()
+        else:
+            import signal
+            os.killpg(process.pid, signal.SIGTERM)
+    except OSError:
+        pass # Already gone
+
+# --- Site Validator ---
+VALIDATE_CACHE = "validate-cache.json"
+DEFAULT_MAX_ASSET_SIZE = 500 * 1024  # Referenced files above this size are reported; "validate": {"max_asset_size": ...}
+
+ValidationIssue = namedtuple("ValidationIssue", "path line kind message") # kind: "missing", "anchor", "duplicate-id", "size"
+ValidationReport = namedtuple("ValidationReport", "issues files parsed seconds")
+
+class _LinkParser(HTMLParser):
+    """Collects a page's ids and every URL it links or loads, with line numbers."""
+    URL_ATTRIBUTES = ("href", "src", "srcset", "poster")
+
+    def __init__(self):
+        super().__init__()
+        self.ids, self.duplicates, self.links = {}, [], []
+        self.in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        line = self.getpos()[0]
+        for name, value in attrs:
+            if not value: continue
+            if name == "id" or (name == "name" and tag == "a"):
+                if name == "id" and value in self.ids: self.duplicates.append((value, line))
+                self.ids.setdefault(value, line)
+            elif name == "srcset":
+                self.links += [(candidate.split()[0], line) for candidate in value.split(",") if candidate.strip()]
+            elif name in self.URL_ATTRIBUTES:
+                self.links.append((value, line))
+        self.in_style = tag == "style"
+
+    def handle_endtag(self, tag):
+        if tag == "style": self.in_style = False
+
+    def handle_data(self, data):
+        if self.in_style: self.links += _css_links(data, self.getpos()[0])
+
+def _css_links(text, first_line=1):
+    return [(match.group(1) or match.group(2), first_line + text.count("\n", 0, match.start())) for match in CSS_URL_PATTERN.finditer(text)]
+
+def scan_links(path, text):
+    """The validator's per-file findings: {"ids": [...], "duplicates": [[id, line]], "links": [[url, line]]}."""
+    if os.path.splitext(path)[1].lower() == ".css":
+        return {"ids": [], "duplicates": [], "links": _css_links(text)}
+    parser = _LinkParser(); parser.feed(text); parser.close()
+    return {"ids": list(parser.ids), "duplicates": parser.duplicates, "links": parser.links}
+
+def _scan_link_file(path):
+    """Reads and scans one file (None if it cannot be read); runs in worker processes."""
+    try:
+        with open(path, "rb") as f: return scan_links(path, f.read().decode("utf-8", errors="replace"))
+    except OSError:
+        return None
+
+class SiteValidator:
+    """Checks the HTML and CSS files under the site root (src/) for missing local files, broken
+    anchors, duplicate ids and oversized assets.
+
+    Parsing is the expensive part, so each file's findings (ids and links with line numbers)
+    are cached in .bws/ under its content hash; only files whose hash changed are parsed
+    again, in a process pool for larger batches. The cross-file checks are cheap and run
+    every time. URLs resolve against the build layout, so "assets/logo.png" in a page finds
+    <project>/assets/logo.png.
+    """
+    EXTENSIONS = (".html", ".htm", ".css")
+
+    def __init__(self, project_path, config=None, jobs=None):
+        self.project_path = os.path.abspath(project_path)
+        config = load_project_config(project_path) if config is None else config
+        self.inputs = config.get("build", {}).get("inputs", DEFAULT_BUILD_INPUTS)
+        self.site_root = os.path.join(self.project_path, next((i for i, o in self.inputs.items() if not o), "src"))
+        self.ignore = ignore_globs(config)
+        self.max_asset_size = config.get("validate", {}).get("max_asset_size", DEFAULT_MAX_ASSET_SIZE)
+        self.jobs = jobs
+        self.cache_path = os.path.join(self.project_path, CACHE_DIR, VALIDATE_CACHE)
+        self.cache = None # Loaded on the first validate(); kept for the next runs
+
+    def collect_files(self):
+        found = {}
+        for directory, dirs, files in os.walk(self.site_root):
+            dirs[:] = [d for d in dirs if not is_ignored(d, self.ignore)]
+            for name in files:
+                if name.lower().endswith(self.EXTENSIONS) and not is_ignored(name, self.ignore):
+                    path = os.path.join(directory, name)
+                    try: found[path] = os.stat(path)
+                    except OSError: pass
+        return found
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f: return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def validate(self):
+        """Scans what changed since the last run and checks the whole site; returns a ValidationReport."""
+        started = time.perf_counter()
+        if self.cache is None: self.cache = self.load_cache()
+        cache, files = self.cache, self.collect_files()
+        # New records are merged into the long-lived cache only once the scan succeeded
+        findings, stale, changed, updates = {}, [], False, {}
+        for path, st in files.items():
+            relative = os.path.relpath(path, self.project_path)
+            record = cache.get(relative)
+            if record and record["stat"] == [st.st_mtime_ns, st.st_size]:
+                findings[path] = record["findings"]; continue
+            try:
+                with open(path, "rb") as f: content_hash = hash_bytes(f.read())
+            except OSError:
+                continue
+            changed = True
+            if record and record["hash"] == content_hash: # Touched but not changed
+                findings[path] = record["findings"]
+                updates[relative] = dict(record, stat=[st.st_mtime_ns, st.st_size])
+            else:
+                stale.append(path)
+                updates[relative] = {"stat": [st.st_mtime_ns, st.st_size], "hash": content_hash}
+        for path, result in self._scan(stale):
+            relative = os.path.relpath(path, self.project_path)
+            if result is None: del updates[relative]; cache.pop(relative, None); continue
+            findings[path] = updates[relative]["findings"] = result
+        cache.update(updates)
+        for relative in [r for r in cache if os.path.join(self.project_path, r) not in files]:
+            del cache[relative]; changed = True
+        if changed:
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                temp_path = self.cache_path + ".tmp"
+                with open(temp_path, "w", encoding="utf-8") as f: f.write(json.dumps(cache))
+                os.replace(temp_path, self.cache_path)
+            except OSError:
+                pass
+        issues = self.check(findings)
+        return ValidationReport(issues, len(files), len(stale), time.perf_counter() - started)
+
+    def _scan(self, paths):
+        if len(paths) < BUILD_POOL_THRESHOLD or self.jobs == 1:
+            for path in paths: yield path, _scan_link_file(path)
+            return
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            for path, result in zip(paths, pool.map(_scan_link_file, paths, chunksize=16)): yield path, result
+
+    def site_file(self, path):
+        """Where a path inside the site root comes from in the project (the inverse of the build inputs)."""
+        relative = os.path.relpath(path, self.site_root).replace(os.sep, "/")
+        if relative.startswith("../"): return path
+        for input_dir, output_dir in self.inputs.items():
+            prefix = output_dir.strip("/") + "/" if output_dir else ""
+            if relative.startswith(prefix):
+                candidate = os.path.join(self.project_path, input_dir, relative[len(prefix):])
+                if os.path.exists(candidate): return candidate
+        return path
+
+    def _resolve(self, url, from_file):
+        """Returns (project file, None for URLs that are not local or "" if missing; URL fragment; whether it is an asset)."""
+        target = resolve_reference(url, from_file, self.site_root)
+        if target is None: return None, "", False
+        source = self.site_file(target)
+        if os.path.isdir(source): source = os.path.join(source, "index.html")
+        if not os.path.isfile(source): return "", "", False
+        return source, unquote(urlsplit(url).fragment), not source.lower().endswith(self.EXTENSIONS)
+
+    def check(self, findings):
+        """Cross-file checks over the scanned findings; returns the issues sorted by file and line."""
+        issues, reported_assets, resolved = [], set(), {}
+        ids = {path: set(found["ids"]) for path, found in findings.items()}
+        for path, found in findings.items():
+            for element_id, line in found["duplicates"]:
+                issues.append(ValidationIssue(path, line, "duplicate-id", f"duplicate id \"{element_id}\""))
+            directory = os.path.dirname(path)
+            for url, line in found["links"]:
+                url = url.strip()
+                if url.startswith("#"):
+                    fragment = unquote(url[1:])
+                    if fragment and fragment != "top" and fragment not in ids[path]:
+                        issues.append(ValidationIssue(path, line, "anchor", f"no element with id \"{fragment}\" for {url}"))
+                    continue
+                # Pages in one folder share most of their links; resolve each (folder, URL) once
+                key = (directory, url)
+                if key not in resolved: resolved[key] = self._resolve(url, path)
+                source, fragment, is_asset = resolved[key]
+                if source is None: continue # External, data: or scheme URL
+                if not source:
+                    issues.append(ValidationIssue(path, line, "missing", f"{url} does not exist")); continue
+                if fragment and source in ids and fragment not in ids[source]:
+                    issues.append(ValidationIssue(path, line, "anchor", f"{url}: no element with id \"{fragment}\""))
+                if is_asset and source not in reported_assets:
+                    reported_assets.add(source)
+                    size = os.path.getsize(source)
+                    if size > self.max_asset_size:
+                        issues.append(ValidationIssue(path, line, "size", f"{url} is {size // 1024} KB (limit {self.max_asset_size // 1024} KB)"))
+        issues.sort(key=lambda issue: (issue.path, issue.line))
+        return issues
+
+def format_validation(report, project_path):
+    """Console lines for a ValidationReport."""
+    lines = [f"{os.path.relpath(issue.path, project_path)}:{issue.line}: {issue.message}" for issue in report.issues]
+    lines.append(f"Validated {report.files} file(s) ({report.parsed} parsed) in {report.seconds * 1000:.0f} ms: "
+                 f"{len(report.issues) or 'no'} issue(s).")
+    return lines